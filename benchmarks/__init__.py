@@ -0,0 +1,4 @@
+"""Benchmarks for the Ofen Innovativ integration.
+
+Run a benchmark from the repository root, e.g. ``python -m benchmarks.bench_transport``.
+"""
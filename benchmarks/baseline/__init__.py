@@ -0,0 +1 @@
+"""The original codec and state types, copied verbatim, for the benchmarks to compare against."""
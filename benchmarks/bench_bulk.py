@@ -0,0 +1,67 @@
+"""Measure bulk decoding of a season of fireplace state frames with NumPy.
+
+Frames of the fake fireplace's burn, polled every 5 seconds, with a fraction of them
+corrupted, are decoded one at a time with codec.parse_message and the message registry,
+and at once with bulk.decode_frames. Requires NumPy.
+Usage: ``python -m benchmarks.bench_bulk [--frames N]``
+"""
+import argparse
+import random
+from time import perf_counter
+
+from custom_components.ofen_innovativ.api import bulk, codec
+from custom_components.ofen_innovativ.api.messages import REGISTRY
+
+from .fake_fireplace import DEFAULT_BURN, FakeFireplace, encode_fireplace_state
+
+POLL_INTERVAL = 5
+
+
+def season_frames(count: int, corrupt_rate: float = 0.01, seed: int = 0):
+    fireplace = FakeFireplace()
+    # The burn repeats, so the frames of one burn are encoded once
+    burn = [codec.format_message(encode_fireplace_state(fireplace.state_at(elapsed)))
+            for elapsed in range(0, int(sum(segment.seconds for segment in DEFAULT_BURN)), POLL_INTERVAL)]
+    frames = [burn[i % len(burn)] for i in range(count)]
+    rng = random.Random(seed)
+    for i in rng.sample(range(count), int(count * corrupt_rate)):
+        frames[i] = frames[i][:-2] + format(int(frames[i][-2:], 16) ^ 0x01, '02x')
+    return frames
+
+
+def decode_one_at_a_time(frames):
+    states = []
+    for frame in frames:
+        try:
+            states.append(REGISTRY.decode(codec.parse_message(frame)))
+        except (ValueError, codec.ChecksumValidationError, codec.PayloadLengthMismatchError,
+                codec.MissingHeaderError):
+            states.append(None)
+    return states
+
+
+def main(count: int):
+    frames = season_frames(count)
+    print(f'{count} frames, {count * POLL_INTERVAL / 86400:.0f} days of polls')
+
+    start = perf_counter()
+    states = decode_one_at_a_time(frames)
+    scalar = perf_counter() - start
+    print(f'one at a time: {scalar:.2f} s')
+
+    start = perf_counter()
+    decoded = bulk.decode_frames(frames)
+    vectorized = perf_counter() - start
+    print(f'         bulk: {vectorized:.2f} s ({scalar / vectorized:.0f}x)')
+
+    valid = sum(state is not None for state in states)
+    if int(decoded['valid'].sum()) != valid:
+        raise AssertionError(f'bulk decoding found {int(decoded["valid"].sum())} valid frames instead of {valid}')
+    if decoded['temperature'][decoded['valid']].sum() != sum(state.temperature for state in states if state):
+        raise AssertionError('bulk decoding disagrees with decoding one at a time')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=1_000_000)
+    main(parser.parse_args().frames)
@@ -0,0 +1,57 @@
+"""Measure the per-frame cost of the message codec.
+
+The current codec and the decoders compiled from the message layouts are compared
+against the original codec and hand-written parser, copied verbatim into
+benchmarks/baseline. Usage: ``python -m benchmarks.bench_codec``
+"""
+import argparse
+from timeit import repeat
+
+from custom_components.ofen_innovativ.api import codec
+from custom_components.ofen_innovativ.api.messages import REGISTRY
+
+from .baseline import codec as baseline_codec, types as baseline_types
+from .standin import FIREPLACE_STATE_MESSAGE
+
+
+def timeit(stmt, number: int) -> float:
+    return min(repeat(stmt, number=number, repeat=5))
+
+
+def _report(name: str, baseline: float, current: float, per: int):
+    print(f'{name:>16}: {baseline / per * 1e9:7.0f} ns -> {current / per * 1e9:7.0f} ns per frame '
+          f'({baseline / current:.1f}x)')
+
+
+def main(number: int):
+    request_payload = b'\x00'
+    _report('format request',
+            timeit(lambda: baseline_codec.format_message(request_payload), number=number),
+            timeit(lambda: codec.format_request(0x00), number=number),
+            number)
+    _report('format payload',
+            timeit(lambda: baseline_codec.format_message(b'\x23\x17\x0a\x11\x0c\x1e'), number=number),
+            timeit(lambda: codec.format_message(b'\x23\x17\x0a\x11\x0c\x1e'), number=number),
+            number)
+    _report('parse message',
+            timeit(lambda: baseline_codec.parse_message(FIREPLACE_STATE_MESSAGE), number=number),
+            timeit(lambda: codec.parse_message(FIREPLACE_STATE_MESSAGE), number=number),
+            number)
+    payload = codec.parse_message(FIREPLACE_STATE_MESSAGE)
+    _report('decode state',
+            timeit(lambda: baseline_types.FireplaceState.parse(payload[1:]), number=number),
+            timeit(lambda: REGISTRY.decode(payload), number=number),
+            number)
+
+    batch = [FIREPLACE_STATE_MESSAGE] * 1000
+    batches = max(number // len(batch), 1)
+    _report('bulk parse',
+            timeit(lambda: [baseline_codec.parse_message(m) for m in batch], number=batches),
+            timeit(lambda: codec.parse_messages(batch), number=batches),
+            batches * len(batch))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=100000)
+    main(parser.parse_args().number)
@@ -0,0 +1,72 @@
+"""Measure scanning a /24 for controllers against local stand-ins.
+
+Stand-in controllers, each with its own MAC address, listen on a few addresses of
+127.0.0.0/24 (all of which are local on Linux), silent servers that accept connections
+but never answer on a few others, and nothing on the rest. The whole subnet is then
+scanned for controllers. Usage: ``python -m benchmarks.bench_discovery [options]``
+"""
+import argparse
+import asyncio
+from time import perf_counter
+
+from custom_components.ofen_innovativ.api.discovery import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_PROBE_TIMEOUT,
+    scan,
+    scan_hosts,
+    serial_from_mac,
+)
+
+from .standin import STATUS_RESPONSE, StandInServer
+
+
+class _Controller(StandInServer):
+    def __init__(self, mac_address: str):
+        super().__init__()
+        self._status_response = STATUS_RESPONSE.replace(b'00:11:22:33:44:55', mac_address.encode())
+
+    async def respond(self, path, body):
+        if path == b'/export/status':
+            return 200, self._status_response
+        return await super().respond(path, body)
+
+
+async def _silent(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    await reader.read()
+    writer.close()
+
+
+async def main(args):
+    controllers = [_Controller(f'00:11:22:33:44:{i:02x}') for i in range(args.controllers)]
+    await controllers[0].start(address='127.0.0.10')
+    port = int(controllers[0].host.rsplit(':', 1)[1])
+    for i, controller in enumerate(controllers[1:], 2):
+        await controller.start(port, address=f'127.0.0.{10 * i}')
+    silent = [await asyncio.start_server(_silent, f'127.0.0.{101 + i}', port) for i in range(args.silent)]
+
+    try:
+        start = perf_counter()
+        found = await scan(scan_hosts('127.0.0.0/24', port), concurrency=args.concurrency, timeout=args.timeout)
+        elapsed = perf_counter() - start
+    finally:
+        for controller in controllers:
+            await controller.stop()
+        for server in silent:
+            server.close()
+
+    print(f'found {len(found)} of {len(controllers)} controllers in {elapsed:.2f} s')
+    expected = {serial_from_mac(f'00:11:22:33:44:{i:02x}') for i in range(args.controllers)}
+    if {controller.serial for controller in found} != expected:
+        raise AssertionError(f'found {found}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    # Controllers listen on 127.0.0.10, .20, ..., silent servers on 127.0.0.101 and up
+    parser.add_argument('--controllers', type=int, default=5, choices=range(1, 10), metavar='1-9',
+                        help='number of stand-in controllers')
+    parser.add_argument('--silent', type=int, default=20, choices=range(0, 151), metavar='0-150',
+                        help='number of servers that never answer')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_PROBE_TIMEOUT)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,142 @@
+"""End-to-end poll benchmarks against a fake fireplace.
+
+Drives OfenInnovativAPIClient and OfenInnovativDataUpdateCoordinator against a local
+FakeFireplace and reports p50/p99 poll latency, requests per second and the peak
+memory allocated per poll. The fake runs in the same process, so the allocations include
+its share. Usage: ``python -m benchmarks.bench_poll [options]``
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+import statistics
+import tempfile
+from time import perf_counter
+import tracemalloc
+from typing import Awaitable, Callable, List
+
+from custom_components.ofen_innovativ.api import OfenInnovativAPIClient
+
+from .fake_fireplace import FakeFireplace
+
+
+@dataclass
+class PollStats:
+    latencies: List[float]
+    elapsed: float
+    requests: int
+    errors: int
+    peak_alloc_bytes: float
+
+    def report(self, name: str):
+        latencies = sorted(self.latencies)
+        if not latencies:
+            print(f'{name:>24}: all {self.errors} polls failed')
+            return
+        p50 = statistics.median(latencies)
+        p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+        print(f'{name:>24}: p50 {p50 * 1e3:7.2f} ms, p99 {p99 * 1e3:7.2f} ms, '
+              f'{self.requests / self.elapsed:7.0f} requests/s, {self.errors} errors, '
+              f'{self.peak_alloc_bytes / 1024:6.1f} KiB peak allocation per poll')
+
+
+async def _measure(poll: Callable[[], Awaitable[object]], fireplace: FakeFireplace, polls: int,
+                   concurrency: int) -> PollStats:
+    latencies = []
+    errors = 0
+    queue = iter(range(polls))
+
+    async def worker():
+        nonlocal errors
+        for _ in queue:
+            start = perf_counter()
+            try:
+                await poll()
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(perf_counter() - start)
+
+    # Warm up, which also establishes connections
+    try:
+        await poll()
+    except Exception:
+        pass
+
+    requests_before = fireplace.requests
+    start = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - start
+    requests = fireplace.requests - requests_before
+
+    # Measure allocations separately, as tracing slows down everything else
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(polls, 100)):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        try:
+            await poll()
+        except Exception:
+            pass
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return PollStats(latencies, elapsed, requests, errors, statistics.mean(peaks))
+
+
+async def bench_client(fireplace: FakeFireplace, args) -> None:
+    for stream_transport in (False, True):
+        async with OfenInnovativAPIClient(fireplace.host, stream_transport=stream_transport) as client:
+            stats = await _measure(client.retrieve_fireplace_state, fireplace, args.polls, args.concurrency)
+        stats.report(f'client ({"stream" if stream_transport else "aiohttp"})')
+
+
+async def bench_coordinator(fireplace: FakeFireplace, args) -> None:
+    # Home Assistant is only needed for the coordinator benchmark
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
+
+    from custom_components.ofen_innovativ.api.polling import AdaptivePollPolicy
+    from custom_components.ofen_innovativ.coordinator import OfenInnovativDataUpdateCoordinator
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        try:
+            hass = HomeAssistant(config_dir)
+        except TypeError:
+            # Older versions of Home Assistant take no configuration directory
+            hass = HomeAssistant()
+            hass.config.config_dir = config_dir
+        async with OfenInnovativAPIClient(fireplace.host) as client:
+            coordinator = OfenInnovativDataUpdateCoordinator(
+                hass=hass,
+                api_client=client,
+                poll_policy=AdaptivePollPolicy(burst_interval=1, active_interval=5, idle_interval=60),
+                session_store=Store(hass, 1, 'bench_poll.sessions'),
+                state_store=Store(hass, 1, 'bench_poll.state'),
+                stale_window=0,
+                sync_clock=False,
+            )
+            # The coordinator updates sequentially
+            stats = await _measure(coordinator.async_refresh, fireplace, args.polls, 1)
+        stats.report('coordinator')
+        await hass.async_stop(force=True)
+
+
+async def main(args):
+    async with FakeFireplace(speed=args.speed, latency=args.latency, jitter=args.jitter,
+                             error_rate=args.error_rate, seed=0) as fireplace:
+        await bench_client(fireplace, args)
+        if not args.skip_coordinator:
+            await bench_coordinator(fireplace, args)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--polls', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=1, help='concurrent pollers for the client benchmarks')
+    parser.add_argument('--speed', type=float, default=60.0, help='speed of the simulated burn')
+    parser.add_argument('--latency', type=float, default=0.0, help='response latency of the fake, in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='standard deviation of the latency, in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of failing requests')
+    parser.add_argument('--skip-coordinator', action='store_true', help='skip the Home Assistant coordinator')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,39 @@
+"""Compare the aiohttp and the stream transport of OfenInnovativAPIClient.
+
+Both transports retrieve the fireplace state and the IP status from a local stand-in
+server. Usage: ``python -m benchmarks.bench_transport [--requests N]``
+"""
+import argparse
+import asyncio
+from time import perf_counter
+
+from custom_components.ofen_innovativ.api import OfenInnovativAPIClient
+
+from .standin import StandInServer
+
+
+async def _bench(host: str, requests: int, stream_transport: bool) -> float:
+    async with OfenInnovativAPIClient(host, stream_transport=stream_transport) as client:
+        # Warm up, which also establishes the connection
+        await client.retrieve_fireplace_state()
+        start = perf_counter()
+        for i in range(requests):
+            if i % 10 == 0:
+                await client.retrieve_ip_status()
+            else:
+                await client.retrieve_fireplace_state()
+        return perf_counter() - start
+
+
+async def main(requests: int):
+    async with StandInServer() as server:
+        for name, stream_transport in (('aiohttp', False), ('stream', True)):
+            elapsed = await _bench(server.host, requests, stream_transport)
+            print(f'{name:>8}: {requests} requests in {elapsed:.3f} s, '
+                  f'{elapsed / requests * 1e6:.0f} us/request, {requests / elapsed:.0f} requests/s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,54 @@
+"""Compare the byte-level response scanners against full parses of the XML documents.
+
+The responses mirror those captured from a controller. Usage: ``python -m benchmarks.bench_xml``
+"""
+import argparse
+from timeit import repeat
+
+from custom_components.ofen_innovativ.api import responses
+
+from .standin import FIREPLACE_STATE_MESSAGE, STATUS_RESPONSE, action_response
+
+
+def _status_group(name: str, instance: str, items: int) -> str:
+    return (f'<statusgroup name="{name}" instance="{instance}">'
+            + ''.join(f'<statusitem name="Item {i}"><value>{i}</value></statusitem>' for i in range(items))
+            + '</statusgroup>')
+
+
+# A status record as returned without filtering on a group, with the interface last
+FULL_STATUS_RESPONSE = (
+    '<?xml version="1.0" encoding="UTF-8"?><statusrecord>'
+    + _status_group('System', '0', 20)
+    + _status_group('Line', '1', 20)
+    + _status_group('Interface', 'eth0', 10)
+    + STATUS_RESPONSE.decode().split('<statusrecord>', 1)[1]
+).encode()
+
+ACTION_RESPONSE = action_response(FIREPLACE_STATE_MESSAGE)
+
+
+def _report(name: str, number: int, full, fast):
+    full_time = min(repeat(full, number=number, repeat=5)) / number
+    fast_time = min(repeat(fast, number=number, repeat=5)) / number
+    print(f'{name:>16}: {full_time * 1e6:7.2f} us -> {fast_time * 1e6:7.2f} us per response '
+          f'({full_time / fast_time:.1f}x)')
+
+
+def main(number: int):
+    assert responses.parse_action_message(ACTION_RESPONSE) == FIREPLACE_STATE_MESSAGE
+    _report('action response', number,
+            lambda: responses._parse_action_message_full(ACTION_RESPONSE),
+            lambda: responses.parse_action_message(ACTION_RESPONSE))
+    _report('status response', number,
+            lambda: responses._parse_mac_address_full(STATUS_RESPONSE),
+            lambda: responses.parse_mac_address(STATUS_RESPONSE))
+    _report('full status', number // 10,
+            lambda: responses._parse_mac_address_full(FULL_STATUS_RESPONSE),
+            lambda: responses.parse_mac_address(FULL_STATUS_RESPONSE))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000)
+    main(parser.parse_args().number)
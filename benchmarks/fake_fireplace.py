@@ -0,0 +1,182 @@
+"""Fake fireplace controller, emulating the framed protocol over a local web server.
+
+Usage: ``python -m benchmarks.fake_fireplace [--port PORT] [--speed FACTOR]`` serves a
+fake fireplace until interrupted, e.g. to point the integration or the CLI at it.
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import random
+import struct
+from time import monotonic
+from typing import Optional, Sequence, Tuple
+
+from custom_components.ofen_innovativ.api import codec
+from custom_components.ofen_innovativ.api.types import DateTimeInfo, FireplaceState
+
+from .standin import StandInServer, action_response
+
+_FIREPLACE_STATE_STRUCT = struct.Struct('>BBHBBBBBBB')
+_DATETIME_STRUCT = struct.Struct('BBBBBB')
+_SET_DATETIME = 0x23
+
+
+@dataclass(frozen=True)
+class BurnSegment:
+    """A stretch of a burn with a constant phase, approaching the given temperature."""
+
+    phase: int
+    seconds: float
+    temperature: int
+    shutter: int
+    door_open_seconds: float = 0.0
+
+
+# Ignition with the door open for refilling, a hot burn, burning down and going out
+DEFAULT_BURN: Sequence[BurnSegment] = (
+    BurnSegment(phase=0, seconds=60, temperature=20, shutter=0),
+    BurnSegment(phase=1, seconds=300, temperature=250, shutter=100, door_open_seconds=30),
+    BurnSegment(phase=2, seconds=1800, temperature=450, shutter=60),
+    BurnSegment(phase=3, seconds=1200, temperature=300, shutter=30),
+    BurnSegment(phase=4, seconds=900, temperature=120, shutter=0),
+    BurnSegment(phase=0, seconds=600, temperature=40, shutter=0),
+)
+
+
+def encode_fireplace_state(state: FireplaceState) -> bytes:
+    """Return the response payload for a fireplace state, the inverse of FireplaceState.parse."""
+    return _FIREPLACE_STATE_STRUCT.pack(
+        FireplaceState.DATA_TYPE,
+        state.phase | (0x10 if state.door else 0x00),
+        state.temperature,
+        state.shutter + 150 if state.movement else state.shutter,
+        state.burn_time_mins // 60,
+        state.burn_time_mins % 60,
+        state.alarm1,
+        state.hood,
+        state.alarm2,
+        state.position,
+    )
+
+
+def encode_datetime(info: DateTimeInfo) -> bytes:
+    """Return the response payload for a date/time, the inverse of DateTimeInfo.parse."""
+    dt = info.datetime
+    return _DATETIME_STRUCT.pack(DateTimeInfo.DATA_TYPE, dt.year - 2000, dt.month + 0x10 * info.source,
+                                 dt.day, dt.hour, dt.minute)
+
+
+class FakeFireplace(StandInServer):
+    """Fake fireplace controller that burns through a sequence of segments.
+
+    The simulated time runs speed times faster than real time, and the burn starts over
+    after the last segment. Each request is delayed by latency plus normally distributed
+    jitter (both in seconds). With error_rate, that fraction of requests fails with an
+    HTTP error, a dropped connection or a corrupted checksum. Like the real controller,
+    the fake processes one request at a time.
+    """
+
+    def __init__(self, burn: Sequence[BurnSegment] = DEFAULT_BURN, speed: float = 1.0, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        super().__init__()
+        self.burn = burn
+        self.speed = speed
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.clock_offset = timedelta(0)
+        self._random = random.Random(seed)
+        self._lock = asyncio.Lock()
+        self._started_at = monotonic()
+        self._burn_seconds = sum(segment.seconds for segment in burn)
+
+    def state_at(self, elapsed: float) -> FireplaceState:
+        """Return the simulated fireplace state after the given number of simulated seconds."""
+        elapsed %= self._burn_seconds
+        segment_start = 0.0
+        burn_start = None
+        previous = self.burn[-1]
+        for segment in self.burn:
+            if segment.phase == 0:
+                burn_start = None
+            elif burn_start is None:
+                burn_start = segment_start
+            if elapsed < segment_start + segment.seconds:
+                break
+            segment_start += segment.seconds
+            previous = segment
+
+        in_segment = elapsed - segment_start
+        # Temperature and shutter approach the segment's targets within its first quarter
+        approach = min(in_segment / segment.seconds * 4, 1.0)
+        temperature = round(previous.temperature + (segment.temperature - previous.temperature) * approach)
+        shutter = round(previous.shutter + (segment.shutter - previous.shutter) * approach)
+
+        return FireplaceState(
+            phase=segment.phase,
+            door=in_segment < segment.door_open_seconds,
+            temperature=temperature,
+            shutter=shutter,
+            movement=shutter != segment.shutter,
+            burn_time_mins=0 if burn_start is None else int((elapsed - burn_start) // 60),
+            hood=0,
+            position=shutter,
+            alarm1=0,
+            alarm2=0,
+        )
+
+    @property
+    def state(self) -> FireplaceState:
+        return self.state_at((monotonic() - self._started_at) * self.speed)
+
+    def handle_payload(self, payload: bytes) -> bytes:
+        """Return the response payload to a request payload."""
+        data_type = payload[0]
+        if data_type == FireplaceState.DATA_TYPE:
+            return encode_fireplace_state(self.state)
+        if data_type == DateTimeInfo.DATA_TYPE:
+            now = (datetime.now() + self.clock_offset).replace(second=0, microsecond=0)
+            return encode_datetime(DateTimeInfo(datetime=now, source=1))
+        if data_type == _SET_DATETIME and len(payload) == 6:
+            yy, month, day, hour, minute = payload[1:]
+            self.clock_offset = datetime(2000 + yy, month, day, hour, minute) - datetime.now()
+            return payload[:1]
+        return b'\xff'
+
+    async def respond(self, path: bytes, body: bytes) -> Optional[Tuple[int, bytes]]:
+        async with self._lock:
+            delay = max(self.latency + self._random.gauss(0.0, self.jitter), 0.0) if self.jitter else self.latency
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            error = None
+            if self.error_rate > 0 and self._random.random() < self.error_rate:
+                error = self._random.choice(('status', 'drop', 'checksum'))
+            if error == 'status':
+                return 500, b''
+            if error == 'drop':
+                return None
+
+            if path != b'/action/status':
+                return await super().respond(path, body)
+            message = body.decode().rsplit(' ', 1)[-1]
+            response_message = codec.format_message(self.handle_payload(codec.parse_message(message)))
+            if error == 'checksum':
+                response_message = response_message[:-4] + 'ffff'
+            return 200, action_response(response_message)
+
+
+async def main(port: int, speed: float):
+    fireplace = FakeFireplace(speed=speed)
+    await fireplace.start(port)
+    print(f'Fake fireplace listening on {fireplace.host}')
+    await fireplace.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--speed', type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.port, args.speed))
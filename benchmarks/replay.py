@@ -0,0 +1,106 @@
+"""Replay a recorded protocol log through the client and the coordinator.
+
+Feeds the responses of a log written by ProtocolRecorder back through
+OfenInnovativAPIClient and OfenInnovativDataUpdateCoordinator, either as fast as
+possible or at the recorded pace (scaled by --speed), and reports the number of polls
+and their throughput. Usage: ``python -m benchmarks.replay LOG [options]``
+"""
+import argparse
+import asyncio
+import tempfile
+from time import perf_counter
+
+from custom_components.ofen_innovativ.api import OfenInnovativAPIClient
+from custom_components.ofen_innovativ.api.recorder import log_files, read_records
+from custom_components.ofen_innovativ.api.replay import ReplayExhausted, ReplayTransport
+
+
+def _load_records(path):
+    records = []
+    for file in log_files(path):
+        records.extend(read_records(file))
+    return records
+
+
+def _report(name: str, polls: int, errors: int, elapsed: float):
+    print(f'{name:>12}: {polls} polls, {errors} errors in {elapsed:.2f} s ({polls / elapsed:.0f} polls/s)')
+
+
+async def replay_client(records, args):
+    transport = ReplayTransport(records, speed=args.speed)
+    polls = errors = 0
+    async with OfenInnovativAPIClient('replay', transport=transport, retries=0) as client:
+        start = perf_counter()
+        while True:
+            try:
+                await client.retrieve_fireplace_state()
+            except ReplayExhausted:
+                break
+            except Exception as e:
+                if args.verbose:
+                    print(f'poll {polls}: {e!r}')
+                errors += 1
+            else:
+                polls += 1
+        elapsed = perf_counter() - start
+    _report('client', polls, errors, elapsed)
+
+
+async def replay_coordinator(records, args):
+    # Home Assistant is only needed for the coordinator replay
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
+
+    from custom_components.ofen_innovativ.api.polling import AdaptivePollPolicy
+    from custom_components.ofen_innovativ.coordinator import OfenInnovativDataUpdateCoordinator
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        try:
+            hass = HomeAssistant(config_dir)
+        except TypeError:
+            # Older versions of Home Assistant take no configuration directory
+            hass = HomeAssistant()
+            hass.config.config_dir = config_dir
+        transport = ReplayTransport(records, speed=args.speed)
+        polls = errors = 0
+        async with OfenInnovativAPIClient('replay', transport=transport, retries=0) as client:
+            coordinator = OfenInnovativDataUpdateCoordinator(
+                hass=hass,
+                api_client=client,
+                poll_policy=AdaptivePollPolicy(burst_interval=1, active_interval=5, idle_interval=60),
+                session_store=Store(hass, 1, 'replay.sessions'),
+                state_store=Store(hass, 1, 'replay.state'),
+                stale_window=0,
+                sync_clock=False,
+            )
+            start = perf_counter()
+            while True:
+                await coordinator.async_refresh()
+                if isinstance(coordinator.last_exception, ReplayExhausted):
+                    break
+                if coordinator.last_update_success:
+                    polls += 1
+                else:
+                    errors += 1
+            elapsed = perf_counter() - start
+        _report('coordinator', polls, errors, elapsed)
+        if args.verbose:
+            for stats in coordinator.sessions.finished:
+                print(stats)
+        await hass.async_stop(force=True)
+
+
+async def main(args):
+    records = _load_records(args.log)
+    await replay_client(records, args)
+    if not args.skip_coordinator:
+        await replay_coordinator(records, args)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('log', help='path of the protocol log, without the rotation suffix')
+    parser.add_argument('--speed', type=float, default=None, help='replay at the recorded pace, sped up by this factor')
+    parser.add_argument('--skip-coordinator', action='store_true', help='skip the Home Assistant coordinator')
+    parser.add_argument('--verbose', action='store_true', help='print errors and finished burn sessions')
+    asyncio.run(main(parser.parse_args()))
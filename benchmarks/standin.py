@@ -0,0 +1,101 @@
+"""Local stand-in for the web server of a fireplace controller."""
+import asyncio
+from typing import Callable, Optional, Tuple
+
+STATUS_RESPONSE = (
+    b'<?xml version="1.0" encoding="UTF-8"?>'
+    b'<statusrecord>'
+    b'<statusgroup name="Interface" instance="wlan0">'
+    b'<statusitem name="IP Address"><value>192.168.1.50</value></statusitem>'
+    b'<statusitem name="MAC Address"><value>00:11:22:33:44:55</value></statusitem>'
+    b'</statusgroup>'
+    b'</statusrecord>'
+)
+
+# A fireplace state response: phase 2, 312 degrees, shutter at 40%, burning for 65 minutes
+FIREPLACE_STATE_MESSAGE = 'aacc33550b00020138280105000000329b00'
+
+
+def action_response(message: str) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<function><return>'
+        '<result>Succeeded</result>'
+        f'<message>{message}</message>'
+        '</return></function>'
+    ).encode()
+
+
+class StandInServer:
+    """Minimal keep-alive HTTP/1.1 server answering the controller's endpoints.
+
+    By default, /export/status returns STATUS_RESPONSE and /action/status returns
+    FIREPLACE_STATE_MESSAGE. A different handler for action requests can be passed as
+    a callable that maps the request body to the response message. Subclasses can
+    override respond, which may also return None to drop the connection.
+    """
+
+    def __init__(self, action_handler: Optional[Callable[[bytes], str]] = None):
+        self._action_handler = action_handler or (lambda body: FIREPLACE_STATE_MESSAGE)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.requests = 0
+
+    @property
+    def host(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f'{host}:{port}'
+
+    async def start(self, port: int = 0, address: str = '127.0.0.1'):
+        self._server = await asyncio.start_server(self._handle_connection, address, port)
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self) -> 'StandInServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def respond(self, path: bytes, body: bytes) -> Optional[Tuple[int, bytes]]:
+        """Return the status and body of the response to a request."""
+        if path == b'/export/status':
+            return 200, STATUS_RESPONSE
+        return 200, action_response(self._action_handler(body))
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                request_line, *header_lines = head[:-4].split(b'\r\n')
+                path = request_line.split(b' ')[1]
+                content_length = 0
+                for line in header_lines:
+                    name, _, value = line.partition(b':')
+                    if name.strip().lower() == b'content-length':
+                        content_length = int(value)
+                body = await reader.readexactly(content_length)
+                self.requests += 1
+                response = await self.respond(path, body)
+                if response is None:
+                    break
+                status, response_body = response
+                writer.write(
+                    b'HTTP/1.1 %d %s\r\n'
+                    b'Content-Type: text/xml\r\n'
+                    b'Content-Length: %d\r\n'
+                    b'\r\n%s' % (status, b'OK' if status == 200 else b'Error', len(response_body), response_body)
+                )
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from aiohttp import ClientConnectionError
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -8,15 +9,57 @@ from homeassistant.const import (
     Platform,
 )
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, LOGGER
+from .const import (
+    DOMAIN,
+    LOGGER,
+    ATTR_SINCE,
+    ATTR_TIER,
+    CONF_SERIAL,
+    EVENT_HISTORY,
+    SERVICE_GET_HISTORY,
+    CONF_ACTIVE_SCAN_INTERVAL,
+    CONF_BURST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_RECORD_PROTOCOL,
+    CONF_STALE_WINDOW,
+    CONF_SYNC_CLOCK,
+    DEFAULT_ACTIVE_SCAN_INTERVAL,
+    DEFAULT_BURST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_SYNC_CLOCK,
+    PROTOCOL_LOG_FILENAME,
+    REQUEST_RETRIES,
+    REQUEST_RETRY_BACKOFF,
+    REQUEST_TIMEOUT,
+    SESSIONS_STORAGE_KEY,
+    SESSIONS_STORAGE_VERSION,
+    STATE_STORAGE_KEY,
+    STATE_STORAGE_VERSION,
+)
 from .api import OfenInnovativAPIClient
+from .api.polling import AdaptivePollPolicy
+from .api.recorder import ProtocolRecorder
 from .coordinator import OfenInnovativDataUpdateCoordinator
+from .exporter import async_get_exporter
+from .history import TIER_15MIN, TIER_1MIN, TIER_RAW
+from .scheduler import async_get_poll_hub
 
 PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
+GET_HISTORY_SCHEMA = vol.Schema({
+    vol.Optional(CONF_SERIAL): cv.string,
+    vol.Optional(ATTR_TIER, default=TIER_RAW): vol.In([TIER_RAW, TIER_1MIN, TIER_15MIN]),
+    vol.Optional(ATTR_SINCE): cv.datetime,
+})
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up IntelliFire from a config entry."""
@@ -25,24 +68,99 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if CONF_HOST not in entry.data:
         raise ConfigEntryAuthFailed
 
-    api_client = OfenInnovativAPIClient(entry.data[CONF_HOST])
+    recorder = None
+    if entry.options.get(CONF_RECORD_PROTOCOL, False):
+        recorder = await hass.async_add_executor_job(
+            ProtocolRecorder, hass.config.path(PROTOCOL_LOG_FILENAME.format(entry_id=entry.entry_id))
+        )
 
-    # Define the update coordinator
-    coordinator = OfenInnovativDataUpdateCoordinator(
-        hass=hass,
-        api_client=api_client,
+    api_client = OfenInnovativAPIClient(
+        entry.data[CONF_HOST],
+        session=async_get_clientsession(hass),
+        request_timeout=REQUEST_TIMEOUT,
+        retries=REQUEST_RETRIES,
+        retry_backoff=REQUEST_RETRY_BACKOFF,
+        recorder=recorder,
     )
 
-    await coordinator.async_config_entry_first_refresh()
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # The client, and the protocol log it owns, are closed if the entry is not set up,
+    # e.g. when the first refresh raises ConfigEntryNotReady and the setup is retried
+    try:
+        # Define the update coordinator
+        coordinator = OfenInnovativDataUpdateCoordinator(
+            hass=hass,
+            api_client=api_client,
+            poll_policy=AdaptivePollPolicy(
+                burst_interval=entry.options.get(CONF_BURST_SCAN_INTERVAL, DEFAULT_BURST_SCAN_INTERVAL),
+                active_interval=entry.options.get(CONF_ACTIVE_SCAN_INTERVAL, DEFAULT_ACTIVE_SCAN_INTERVAL),
+                idle_interval=entry.options.get(CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL),
+            ),
+            session_store=Store(
+                hass, SESSIONS_STORAGE_VERSION, SESSIONS_STORAGE_KEY.format(entry_id=entry.entry_id)
+            ),
+            state_store=Store(hass, STATE_STORAGE_VERSION, STATE_STORAGE_KEY.format(entry_id=entry.entry_id)),
+            stale_window=entry.options.get(CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW),
+            sync_clock=entry.options.get(CONF_SYNC_CLOCK, DEFAULT_SYNC_CLOCK),
+        )
+
+        await coordinator.async_load_sessions()
+        # Set up the entities from the last known state if there is one, and leave the first
+        # refresh to the poll hub, so that a slow fireplace does not hold up the startup
+        if not await coordinator.async_restore_state(entry.unique_id):
+            await coordinator.async_config_entry_first_refresh()
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        await api_client.close()
+        raise
+    entry.async_on_unload(async_get_poll_hub(hass).async_register(coordinator, poll_now=coordinator.stale))
+    entry.async_on_unload(async_get_exporter(hass).async_add_coordinator(entry.entry_id, coordinator))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    if not hass.services.has_service(DOMAIN, SERVICE_GET_HISTORY):
+        hass.services.async_register(DOMAIN, SERVICE_GET_HISTORY, _async_get_history, schema=GET_HISTORY_SCHEMA)
 
     return True
 
 
+async def _async_get_history(call: ServiceCall) -> None:
+    """Fire an event with the recorded history of each (or the given) fireplace."""
+    since = call.data.get(ATTR_SINCE)
+    if since is not None:
+        # Times without a time zone are in the time zone of Home Assistant, not of the system
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+        since = dt_util.as_utc(since)
+    coordinator: OfenInnovativDataUpdateCoordinator
+    for coordinator in call.hass.data[DOMAIN].values():
+        if CONF_SERIAL in call.data and coordinator.data.serial != call.data[CONF_SERIAL]:
+            continue
+        columns = coordinator.history.as_dict(
+            call.data[ATTR_TIER], since=None if since is None else dt_util.as_timestamp(since)
+        )
+        call.hass.bus.async_fire(EVENT_HISTORY, {
+            CONF_SERIAL: coordinator.data.serial,
+            ATTR_TIER: call.data[ATTR_TIER],
+            **columns,
+        })
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when its options have changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: OfenInnovativDataUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        # Stop polling and exporting the fireplace before its client is closed, rather
+        # than in the unload callbacks, which only run after this
+        await async_get_poll_hub(hass).async_unregister(coordinator)
+        async_get_exporter(hass).async_remove_coordinator(entry.entry_id)
+        await coordinator.api_client.close()
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_GET_HISTORY)
 
     return unload_ok
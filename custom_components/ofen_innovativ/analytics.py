@@ -0,0 +1,148 @@
+"""Streaming analytics of burn sessions."""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from .api.types import FireplaceState
+
+# Gaps between samples longer than this (e.g. while Home Assistant was down) are not
+# attributed to any phase, temperature or shutter position.
+MAX_SAMPLE_GAP_SECONDS = 600.0
+
+
+@dataclass(frozen=True)
+class BurnSessionStats:
+    """Statistics of a burn session, from the fire being lit until it is out."""
+
+    start: float
+    end: Optional[float]
+    duration_seconds: float
+    peak_temperature: int
+    mean_temperature: Optional[float]
+    shutter_mean_opening: Optional[float]
+    door_openings: int
+    fuel_loads: int
+    phase_seconds: Tuple[Tuple[int, float], ...]
+
+    @property
+    def finished(self) -> bool:
+        return self.end is not None
+
+    def as_list(self) -> list:
+        """Return a compact representation for storage."""
+        return [self.start, self.end, self.duration_seconds, self.peak_temperature, self.mean_temperature,
+                self.shutter_mean_opening, self.door_openings, self.fuel_loads,
+                [list(item) for item in self.phase_seconds]]
+
+    @classmethod
+    def from_list(cls, data: list) -> BurnSessionStats:
+        """Restore statistics from their compact representation."""
+        *fields, phase_seconds = data
+        return cls(*fields, phase_seconds=tuple((int(phase), float(seconds)) for phase, seconds in phase_seconds))
+
+
+class _BurnSession:
+    """Running aggregates of a burn session, updated in constant time per sample."""
+
+    def __init__(self, timestamp: float, state: FireplaceState) -> None:
+        self.start = timestamp
+        self.peak_temperature = state.temperature
+        self.door_openings = 0
+        # Lighting the fire counts as the first load
+        self.fuel_loads = 1
+        self.door_opened_since_load = state.door
+        self.weighted_seconds = 0.0
+        self.temperature_integral = 0.0
+        self.shutter_integral = 0.0
+        self.phase_seconds: Dict[int, float] = {}
+
+    def add(self, timestamp: float, state: FireplaceState, previous_timestamp: float,
+            previous: FireplaceState) -> None:
+        # The time since the previous sample is attributed to the previous state
+        elapsed = timestamp - previous_timestamp
+        if 0 < elapsed <= MAX_SAMPLE_GAP_SECONDS:
+            self.weighted_seconds += elapsed
+            self.temperature_integral += previous.temperature * elapsed
+            self.shutter_integral += previous.shutter * elapsed
+            self.phase_seconds[previous.phase] = self.phase_seconds.get(previous.phase, 0.0) + elapsed
+
+        self.peak_temperature = max(self.peak_temperature, state.temperature)
+        if state.door and not previous.door:
+            self.door_openings += 1
+            self.door_opened_since_load = True
+        if state.burn_time_mins < previous.burn_time_mins and self.door_opened_since_load:
+            self.fuel_loads += 1
+            self.door_opened_since_load = state.door
+
+    def stats(self, now: float, end: Optional[float] = None) -> BurnSessionStats:
+        weighted = self.weighted_seconds
+        return BurnSessionStats(
+            start=self.start,
+            end=end,
+            duration_seconds=now - self.start,
+            peak_temperature=self.peak_temperature,
+            mean_temperature=self.temperature_integral / weighted if weighted else None,
+            shutter_mean_opening=self.shutter_integral / weighted if weighted else None,
+            door_openings=self.door_openings,
+            fuel_loads=self.fuel_loads,
+            phase_seconds=tuple(sorted(self.phase_seconds.items())),
+        )
+
+
+class BurnSessionTracker:
+    """Split a stream of fireplace states into burn sessions.
+
+    A session starts when the phase leaves 0 and ends when it returns to 0. A reset of
+    the burn time after the door has been opened counts as another load of fuel within
+    the session, whereas a reset without the door having been opened means that the
+    controller started over, and therefore starts a new session.
+    """
+
+    def __init__(self, finished: Iterable[BurnSessionStats] = (), max_finished: int = 100) -> None:
+        """Initialize the tracker with previously finished sessions."""
+        self.finished: Deque[BurnSessionStats] = deque(finished, maxlen=max_finished)
+        self._session: Optional[_BurnSession] = None
+        self._previous: Optional[FireplaceState] = None
+        self._previous_timestamp = 0.0
+
+    def add(self, timestamp: float, state: FireplaceState) -> Optional[BurnSessionStats]:
+        """Add a sample, and return the statistics of the session it finished, if any."""
+        previous, previous_timestamp = self._previous, self._previous_timestamp
+        self._previous, self._previous_timestamp = state, timestamp
+        session = self._session
+        finished = None
+
+        if session is not None:
+            restarted = (state.burn_time_mins < previous.burn_time_mins and not session.door_opened_since_load
+                         and state.phase != 0)
+            if state.phase == 0 or restarted:
+                session.add(timestamp, state, previous_timestamp, previous)
+                finished = session.stats(timestamp, end=timestamp)
+                self.finished.append(finished)
+                session = self._session = None
+            else:
+                session.add(timestamp, state, previous_timestamp, previous)
+
+        if session is None and state.phase != 0:
+            self._session = _BurnSession(timestamp, state)
+        return finished
+
+    @property
+    def current(self) -> Optional[BurnSessionStats]:
+        """Return the statistics of the ongoing session."""
+        if self._session is None:
+            return None
+        return self._session.stats(self._previous_timestamp)
+
+    @property
+    def latest(self) -> Optional[BurnSessionStats]:
+        """Return the statistics of the ongoing session, or else of the last finished one."""
+        if self._session is not None:
+            return self.current
+        return self.finished[-1] if self.finished else None
+
+    def finished_as_lists(self) -> List[list]:
+        """Return the finished sessions in their compact representation."""
+        return [stats.as_list() for stats in self.finished]
@@ -0,0 +1,149 @@
+"""Poll Ofen-Innovativ fireplace controllers and write their state as NDJSON.
+
+Polls any number of hosts concurrently, with a bounded number of requests in flight,
+and writes one JSON object per line for every fireplace state and controller clock
+reading (and error), to stdout or a file. Each host is polled at an adaptive interval,
+and its clock every --datetime-interval seconds. With --once, every host is polled once
+and the exit status tells whether all polls succeeded.
+"""
+import argparse
+import asyncio
+from dataclasses import asdict
+from datetime import datetime, timezone
+import heapq
+import json
+import sys
+from time import monotonic
+from typing import IO, Any, Dict, List, Tuple
+
+from aiohttp import ClientSession, TCPConnector
+
+from .client import OfenInnovativAPIClient
+from .polling import AdaptivePollPolicy
+from .resilience import TRANSIENT_ERRORS
+
+# The codec errors are not Exception subclasses, but must not end the polling of other hosts
+_POLL_ERRORS = (Exception, *TRANSIENT_ERRORS)
+
+
+class _Host:
+    def __init__(self, client: OfenInnovativAPIClient, poll_policy: AdaptivePollPolicy):
+        self.client = client
+        self.poll_policy = poll_policy
+        self.datetime_due = 0.0
+
+
+def _write(output: IO[str], host: str, record_type: str, **fields: Any):
+    record: Dict[str, Any] = {
+        'host': host,
+        'time': datetime.now(timezone.utc).isoformat(),
+        'type': record_type,
+        **fields,
+    }
+    output.write(json.dumps(record, default=str) + '\n')
+    output.flush()
+
+
+async def _poll(host: _Host, args, output: IO[str]) -> Tuple[bool, float]:
+    """Poll a host, write the records and return whether it succeeded and the interval until its next poll."""
+    client = host.client
+    now = monotonic()
+    ok = True
+    try:
+        state = await client.retrieve_fireplace_state()
+    except _POLL_ERRORS as e:
+        _write(output, client.host, 'error', request='fireplace_state', error=repr(e))
+        ok = False
+        interval = host.poll_policy.active_interval
+    else:
+        _write(output, client.host, 'fireplace_state', **asdict(state))
+        interval = host.poll_policy.update(state, now)
+
+    if args.once or now >= host.datetime_due:
+        host.datetime_due = now + args.datetime_interval
+        try:
+            info = await client.retrieve_system_datetime()
+        except _POLL_ERRORS as e:
+            _write(output, client.host, 'error', request='system_datetime', error=repr(e))
+            ok = False
+        else:
+            _write(output, client.host, 'system_datetime', datetime=info.datetime.isoformat(), source=info.source)
+    return ok, interval
+
+
+async def run(args, output: IO[str]) -> bool:
+    """Poll the hosts until cancelled or, with --once, poll each host once, and return whether all polls succeeded."""
+    connector = TCPConnector(limit_per_host=1, keepalive_timeout=60)
+    async with ClientSession(connector=connector) as session:
+        hosts = [
+            _Host(
+                OfenInnovativAPIClient(host_name, session=session, request_timeout=args.timeout),
+                AdaptivePollPolicy(args.burst_interval, args.active_interval, args.idle_interval),
+            )
+            for host_name in args.hosts
+        ]
+        # Hosts ordered by the time of their next poll, taken up by a fixed number of workers
+        schedule: List[Tuple[float, int]] = [(0.0, i) for i in range(len(hosts))]
+        wakeup = asyncio.Event()
+        all_ok = True
+
+        async def worker():
+            nonlocal all_ok
+            while True:
+                if not schedule:
+                    if args.once:
+                        return
+                    # All hosts are being polled by other workers
+                    wakeup.clear()
+                    await wakeup.wait()
+                    continue
+                due, i = schedule[0]
+                delay = due - monotonic()
+                if delay > 0:
+                    wakeup.clear()
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                heapq.heappop(schedule)
+                ok, interval = await _poll(hosts[i], args, output)
+                all_ok = all_ok and ok
+                if not args.once:
+                    heapq.heappush(schedule, (monotonic() + interval, i))
+                    wakeup.set()
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(args.workers, len(hosts)))))
+        finally:
+            for host in hosts:
+                await host.client.close()
+    return all_ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('hosts', nargs='+', metavar='host', help='host name or address (and port) of a controller')
+    parser.add_argument('--once', action='store_true', help='poll every host once and exit')
+    parser.add_argument('--output', '-o', help='file to append the records to, instead of stdout')
+    parser.add_argument('--workers', type=int, default=8, help='maximum number of hosts polled at the same time')
+    parser.add_argument('--burst-interval', type=float, default=2, help='poll interval after door or shutter movement')
+    parser.add_argument('--active-interval', type=float, default=5, help='poll interval while a fire is burning')
+    parser.add_argument('--idle-interval', type=float, default=60, help='poll interval while the fire is out')
+    parser.add_argument('--datetime-interval', type=float, default=300, help='interval of polling the clock')
+    parser.add_argument('--timeout', type=float, default=10, help='deadline of a single request')
+    args = parser.parse_args()
+
+    output = open(args.output, 'a') if args.output else sys.stdout
+    try:
+        ok = asyncio.run(run(args, output))
+    except KeyboardInterrupt:
+        ok = True
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""Vectorized decoding of many frames at once, for offline analysis. Requires NumPy."""
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Tuple, Type, Union
+
+from . import codec
+from .messages import REGISTRY, Field
+from .types import FireplaceState
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _numpy():
+    # NumPy is only needed here, so it is not a requirement of the integration
+    try:
+        import numpy
+    except ImportError as err:
+        raise ImportError('bulk decoding requires NumPy, install it with "pip install numpy"') from err
+    return numpy
+
+
+def _frame_buffer(frames: Iterable[Union[str, bytes]]) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """Concatenate the frames, given as hex strings or bytes, and return the buffer and their bounds."""
+    np = _numpy()
+    if not isinstance(frames, (list, tuple)):
+        frames = list(frames)
+    if frames and isinstance(frames[0], str):
+        lengths = np.fromiter(map(len, frames), dtype=np.int64, count=len(frames))
+        if (lengths & 1).any():
+            odd = frames[int(np.flatnonzero(lengths & 1)[0])]
+            raise ValueError(f'message {odd!r} has an odd number of hex digits')
+        data = bytes.fromhex(''.join(frames))
+        lengths >>= 1
+    else:
+        lengths = np.fromiter(map(len, frames), dtype=np.int64, count=len(frames))
+        data = b''.join(frames)
+    ends = np.cumsum(lengths)
+    return np.frombuffer(data, dtype=np.uint8), ends - lengths, ends
+
+
+def _validated_groups(buffer: 'np.ndarray', starts: 'np.ndarray',
+                      ends: 'np.ndarray') -> Iterator[Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']]:
+    """Validate the frames in buffer[starts:ends] grouped by their length.
+
+    Yield the indices of the frames of each length, a matrix of their payloads with a
+    row for each byte position and a column for each frame, and whether each of them is
+    valid. All frames of a length that are valid have the
+    same header length, so that their payloads are a plain slice of the matrix of
+    frames.
+    """
+    np = _numpy()
+    lengths = ends - starts
+    order = np.argsort(lengths, kind='stable')
+    sorted_lengths = lengths[order]
+    group_lengths, group_starts = np.unique(sorted_lengths, return_index=True)
+    header = np.frombuffer(codec._HEADER, dtype=np.uint8)
+    padded = np.append(buffer, np.zeros(lengths.max(initial=0), dtype=np.uint8))
+    for length, group_start, group_end in zip(group_lengths.tolist(), group_starts.tolist(),
+                                              [*group_starts[1:].tolist(), len(order)]):
+        rows = order[group_start:group_end]
+        if length < codec._MIN_FRAME_LEN:
+            yield rows, np.zeros((0, len(rows)), dtype=np.uint8), np.zeros(len(rows), dtype=bool)
+            continue
+        # Rows of a strided view of the buffer, transposed so that each byte position is
+        # contiguous, as NumPy reduces over long contiguous axes much faster
+        frames = np.ascontiguousarray(np.lib.stride_tricks.sliding_window_view(padded, length)[starts[rows]].T)
+        valid = frames[0] == header[0]
+        for i in range(1, codec._HEADER_LEN):
+            valid &= frames[i] == header[i]
+        payload_len = length - codec._HEADER_LEN - 1 - codec._CHECKSUM.size
+        if payload_len >= 0xff:
+            # Payloads of 255 bytes and more have a second length byte
+            payload_len -= 1
+            valid &= (frames[codec._HEADER_LEN] == 0xff) & (frames[codec._HEADER_LEN + 1] == payload_len - 0xff)
+        else:
+            valid &= frames[codec._HEADER_LEN] == payload_len
+        payloads = frames[length - codec._CHECKSUM.size - payload_len:length - codec._CHECKSUM.size]
+        checksums = frames[-2].astype(np.int64) | frames[-1].astype(np.int64) << 8
+        valid &= payloads.sum(axis=0, dtype=np.int64) & 0xffff == checksums
+        yield rows, payloads, valid
+
+
+def validate_frames(frames: Iterable[Union[str, bytes]]) -> 'np.ndarray':
+    """Return whether each of the frames, given as hex strings or bytes, passes the checks of codec.parse_message."""
+    np = _numpy()
+    buffer, starts, ends = _frame_buffer(frames)
+    valid = np.zeros(len(starts), dtype=bool)
+    for rows, _, group_valid in _validated_groups(buffer, starts, ends):
+        valid[rows] = group_valid
+    return valid
+
+
+def _decode_field(field: Field, byte_at) -> 'np.ndarray':
+    np = _numpy()
+    if field.base is not None:
+        value = byte_at(field.offset)
+        for i in range(1, field.width):
+            value = value * field.base + byte_at(field.offset + i)
+    else:
+        value = 0
+        for i in range(field.width):
+            shift = 8 * (i if field.byteorder == 'little' else field.width - 1 - i)
+            value = value | byte_at(field.offset + i) << shift
+        if field.signed:
+            value = np.where(value >> (8 * field.width - 1), value - (1 << 8 * field.width), value)
+    if field.shift:
+        value = value >> field.shift
+    if field.mask is not None:
+        value = value & field.mask
+    if field.add:
+        value = value + field.add
+    if field.offset_above is not None:
+        threshold, amount = field.offset_above
+        value = np.where(value > threshold, value - amount, value)
+    if field.above is not None:
+        return value > field.above
+    if field.values is not None:
+        return np.isin(value, list(field.values))
+    return value
+
+
+def decode_frames(frames: Iterable[Union[str, bytes]], message_type: Type[Any] = FireplaceState) -> 'np.ndarray':
+    """Decode frames, given as hex strings or bytes, into a NumPy structured array.
+
+    There is a row for each frame, with a column for each field of the message layout
+    and a "valid" column. Values composed by functions, such as DateTimeInfo.datetime,
+    are left out (and so are not checked), but the values they are composed of are
+    included. Frames that fail validation, or hold a message of another type or length,
+    are not valid and have zeros in all other columns. The values are the same as those
+    of message_type.parse.
+    """
+    np = _numpy()
+    data_type = message_type.DATA_TYPE
+    layout, exact_size = REGISTRY.layouts[data_type]
+    fields = [entry for entry in layout if isinstance(entry, Field)]
+    size = max((field.offset + field.width for field in fields), default=0)
+    # Narrow columns, as filling in the structured array is bound by its size
+    dtypes = [(field.name, np.bool_ if field.above is not None or field.values is not None else
+               np.int64 if field.width > 2 and field.base is None else np.int32) for field in fields]
+
+    buffer, starts, ends = _frame_buffer(frames)
+    result = np.zeros(len(starts), dtype=[*dtypes, ('valid', np.bool_)])
+    for rows, payloads, valid in _validated_groups(buffer, starts, ends):
+        payload_len = payloads.shape[0] - 1
+        if payload_len < 0 or (payload_len != size if exact_size else payload_len < size):
+            continue
+        valid &= payloads[0] == data_type
+        all_valid = valid.all()
+        # Frames of a single length, as in most captures, need not be scattered
+        target = slice(None) if len(rows) == len(starts) else rows
+        for field in fields:
+            value = _decode_field(field, lambda offset: payloads[1 + offset].astype(np.int64))
+            result[field.name][target] = value if all_valid else np.where(valid, value, 0)
+        result['valid'][target] = valid
+    return result
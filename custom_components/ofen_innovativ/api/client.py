@@ -1,33 +1,126 @@
-import xml.etree.ElementTree as ET
-from aiohttp import ClientSession
+import asyncio
+import logging
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 from datetime import datetime
-from typing import Optional
+from time import monotonic, perf_counter, time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
 
-from . import codec
+from . import codec, metrics, responses
+from .command_queue import PRIORITY_POLL, PRIORITY_WRITE, CommandQueue
+from .messages import REGISTRY
+from .polling import AdaptivePollPolicy
+from .recorder import KIND_ERROR, KIND_RESPONSE, ProtocolRecorder
+from .resilience import TRANSIENT_ERRORS, CircuitBreaker, backoff_delay
+from .transport import StreamTransport
+from .watch import OVERFLOW_DROP, FieldChange, StateWatcher, field_changes
 from .types import (
     IPStatus,
     FireplaceState,
     DateTimeInfo,
 )
-from .errors import (
-    ResponseParseError,
-    ResponseValueError,
-    UnexpectedResponseDataType,
-)
+from .errors import CircuitOpenError, UnexpectedResponseDataType
+
+_LOGGER = logging.getLogger(__name__)
+
+_IP_STATUS_KEY = 'ip_status'
+
+# Settings of the connection pool of sessions created by the client itself. The
+# controller only processes one request at a time, so there is no point in opening
+# more than one connection to it.
+_CONNECTIONS_PER_HOST = 1
+_KEEPALIVE_TIMEOUT = 60.0
+
+_RETRY_BACKOFF_CAP = 5.0
 
 
 class OfenInnovativAPIClient:
+    """Client for the web interface of an Ofen-Innovativ fireplace controller.
+
+    If no session is given, the client creates (and closes) its own session, which
+    keeps a single connection to the controller alive between requests. A session
+    that is passed in is shared and is left open when the client is closed.
+
+    Concurrent retrievals of the same piece of data share a single in-flight request.
+    If cache_ttl is positive, a retrieved value is additionally reused for that many
+    seconds without contacting the controller again.
+
+    Each request must complete within request_timeout seconds. Requests failing with a
+    transient error are retried up to retries times, after an exponentially growing,
+    randomized delay. Failures that persist open the circuit breaker, which then rejects
+    requests with CircuitOpenError until a single probing request succeeds.
+
+    The duration of each stage of a request, as well as the number of requests, retries
+    and errors, are recorded in metrics.
+
+    Commands on the controller's line are sent one at a time through a command queue, in
+    which writes take priority over polls, and pending writes of the same kind are merged
+    so that only the latest one is sent.
+
+    Instead of HTTP, requests can be sent through a transport object with an async post
+    method, such as a ReplayTransport. If a recorder is given, every request is logged to
+    it together with its response or error; the client takes ownership of the recorder.
+    """
+
     _host: str
+    _base_url: str
     _session: Optional[ClientSession]
+    _owns_session: bool
+    _transport: Optional[Any]
+    _recorder: Optional[ProtocolRecorder]
+    _cache_ttl: float
+    _inflight: Dict[Hashable, 'asyncio.Future[Any]']
+    _cache: Dict[Hashable, Tuple[float, Any]]
+    _timeout: ClientTimeout
+    _retries: int
+    _retry_backoff: float
+    _circuit_breaker: CircuitBreaker
+    metrics: metrics.ClientMetrics
+    _line_queue: CommandQueue
+    _watcher: Optional[StateWatcher]
 
-    def __init__(self, fireplace_host):
+    def __init__(self, fireplace_host, session: Optional[ClientSession] = None, cache_ttl: float = 0.0,
+                 stream_transport: bool = False, request_timeout: float = 10.0, retries: int = 2,
+                 retry_backoff: float = 0.5, circuit_breaker: Optional[CircuitBreaker] = None,
+                 transport: Optional[Any] = None, recorder: Optional[ProtocolRecorder] = None):
         self._host = fireplace_host
-        self._session = ClientSession(f'http://{fireplace_host}')
+        self._base_url = f'http://{fireplace_host}'
+        if transport is None and stream_transport:
+            transport = StreamTransport(fireplace_host, timeout=request_timeout)
+        self._transport = transport
+        self._recorder = recorder
+        self._owns_session = session is None and transport is None
+        if self._owns_session:
+            session = ClientSession(connector=TCPConnector(
+                limit_per_host=_CONNECTIONS_PER_HOST,
+                keepalive_timeout=_KEEPALIVE_TIMEOUT,
+            ))
+        self._session = session
+        self._cache_ttl = cache_ttl
+        self._inflight = {}
+        self._cache = {}
+        self._timeout = ClientTimeout(total=request_timeout)
+        self._retries = retries
+        self._retry_backoff = retry_backoff
+        self._circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self.metrics = metrics.ClientMetrics()
+        self._line_queue = CommandQueue(self.metrics)
+        self._watcher = None
 
     async def close(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        await self._line_queue.close()
+        if self._transport is not None:
+            await self._transport.close()
+            self._transport = None
         if self._session is not None:
-            await self._session.close()
+            if self._owns_session:
+                await self._session.close()
             self._session = None
+        if self._recorder is not None:
+            await self._recorder.aclose()
+            self._recorder = None
 
     async def __aenter__(self) -> 'OfenInnovativAPIClient':
         return self
@@ -39,33 +132,64 @@ class OfenInnovativAPIClient:
     def host(self):
         return self._host
 
-    async def retrieve_ip_status(self):
-        async with self._session.post('/export/status', data='optionalGroupList=Interface:wlan0') as resp:
-            resp.raise_for_status()
-            resp_bytes = await resp.read()
-        root_elem = ET.XML(resp_bytes)
-        mac_addr = None
-        if root_elem.tag != 'statusrecord':
-            raise ResponseParseError(f'expected root element of response to have tag statusrecord, not {root_elem.tag}')
-        for sg in root_elem:
-            if mac_addr is not None:
-                break
-            if sg.tag != 'statusgroup' or sg.get('name') != 'Interface' or sg.get('instance') != 'wlan0':
-                continue
-            for si in sg:
-                if si.tag != 'statusitem' or si.get('name') != 'MAC Address':
-                    continue
-                mac_addr = si.findtext('value')
-                break
-
-        if mac_addr is None:
-            raise ResponseValueError('response contained no MAC address')
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of commands waiting to be sent on the controller's line."""
+        return len(self._line_queue)
+
+    @property
+    def circuit_closed(self) -> bool:
+        """Return whether requests are currently let through to the controller."""
+        return self._circuit_breaker.is_closed
+
+    async def retrieve_ip_status(self) -> IPStatus:
+        return await self._single_flight(_IP_STATUS_KEY, self._retrieve_ip_status)
+
+    async def _retrieve_ip_status(self) -> IPStatus:
+        resp_bytes = await self._post('/export/status', 'optionalGroupList=Interface:wlan0')
+        start = perf_counter()
+        mac_addr = responses.parse_mac_address(resp_bytes)
+        self.metrics.observe(metrics.XML_PARSE, perf_counter() - start)
 
         return IPStatus(mac_address=mac_addr)
 
     async def retrieve_fireplace_state(self) -> FireplaceState:
         return await self._retrieve_state(FireplaceState, m=500)
 
+    async def watch(self, per_field: bool = False, buffer: int = 16, overflow: str = OVERFLOW_DROP,
+                    poll_policy: Optional[AdaptivePollPolicy] = None
+                    ) -> AsyncIterator[Union[FireplaceState, FieldChange]]:
+        """Iterate over the changes of the fireplace state.
+
+        Yields the current state, and then every state that differs from the previous one,
+        or, if per_field is set, a FieldChange for every field that changed. All watches of
+        a client share a single poll loop, which polls at the intervals decided by the poll
+        policy of the first watch (by default, every 2 to 60 seconds). Up to buffer states
+        are kept for a watch that does not keep up; beyond that, the overflow policy
+        OVERFLOW_DROP drops the oldest of them, whereas OVERFLOW_COALESCE only ever keeps
+        the latest state. The iteration ends when the client is closed.
+        """
+        if self._watcher is None:
+            if poll_policy is None:
+                poll_policy = AdaptivePollPolicy(burst_interval=2, active_interval=5, idle_interval=60)
+            self._watcher = StateWatcher(self.retrieve_fireplace_state, poll_policy)
+        watcher = self._watcher
+        subscription = watcher.subscribe(buffer, overflow)
+        try:
+            previous = None
+            while True:
+                state = await subscription.get()
+                if state is None:
+                    return
+                if per_field:
+                    for change in field_changes(previous, state):
+                        yield change
+                else:
+                    yield state
+                previous = state
+        finally:
+            watcher.unsubscribe(subscription)
+
     async def retrieve_system_datetime(self) -> DateTimeInfo:
         return await self._retrieve_state(DateTimeInfo, m=300)
 
@@ -79,21 +203,127 @@ class OfenInnovativAPIClient:
         payload += to.day.to_bytes(1, byteorder='little')
         payload += to.hour.to_bytes(1, byteorder='little')
         payload += to.minute.to_bytes(1, byteorder='little')
-        return await self._post_status_action_bytes(payload, m=300)
+        self._cache.pop(DateTimeInfo.DATA_TYPE, None)
+        return await self._call(lambda: self._post_status_action_bytes(
+            payload, m=300, priority=PRIORITY_WRITE, merge_key=payload[0]))
+
+    async def _single_flight(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        if self._cache_ttl > 0 and (cached := self._cache.get(key)) is not None:
+            fetched_at, value = cached
+            if monotonic() - fetched_at <= self._cache_ttl:
+                return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_cache(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_flight(key, t))
+        # Shield the shared request, so that a cancelled caller does not cancel it for everyone
+        return await asyncio.shield(task)
+
+    async def _fetch_and_cache(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        value = await self._call(fetch)
+        if self._cache_ttl > 0:
+            self._cache[key] = (monotonic(), value)
+        return value
+
+    def _finish_flight(self, key: Hashable, task: 'asyncio.Future[Any]'):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case all callers have been cancelled
+            task.exception()
+
+    async def _call(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        breaker = self._circuit_breaker
+        try:
+            probing = breaker.acquire(monotonic())
+        except CircuitOpenError:
+            self.metrics.increment(metrics.CIRCUIT_REJECTIONS)
+            raise
+        # An open circuit is probed with a single request
+        attempts = 1 if probing else self._retries + 1
+        try:
+            for attempt in range(attempts):
+                if attempt > 0:
+                    self.metrics.increment(metrics.RETRIES)
+                    await asyncio.sleep(backoff_delay(attempt - 1, self._retry_backoff, _RETRY_BACKOFF_CAP))
+                try:
+                    value = await fetch()
+                except TRANSIENT_ERRORS as err:
+                    if isinstance(err, codec.ChecksumValidationError):
+                        self.metrics.increment(metrics.CHECKSUM_FAILURES)
+                    if attempt + 1 < attempts:
+                        continue
+                    self.metrics.increment(metrics.FAILURES)
+                    breaker.record_failure(monotonic())
+                    raise
+                except Exception:
+                    # The controller responded, if not as expected
+                    self.metrics.increment(metrics.FAILURES)
+                    breaker.record_success()
+                    raise
+                breaker.record_success()
+                return value
+        finally:
+            if probing:
+                breaker.release()
 
     async def _retrieve_state(self, state_type, n=None, m=None, t=None):
+        return await self._single_flight(
+            state_type.DATA_TYPE, lambda: self._fetch_state(state_type, n=n, m=m, t=t))
+
+    async def _fetch_state(self, state_type, n=None, m=None, t=None):
         data_type = state_type.DATA_TYPE
-        resp_payload = await self._post_status_action_bytes(data_type.to_bytes(1, byteorder='little'), n=n, m=m, t=t)
+        resp_message = await self._post_status_action_raw(codec.format_request(data_type), n=n, m=m, t=t)
+        start = perf_counter()
+        resp_payload = codec.parse_message(resp_message)
+        parsed = perf_counter()
+        self.metrics.observe(metrics.MESSAGE_PARSE, parsed - start)
         if resp_payload[0] != data_type:
+            self.metrics.increment(metrics.UNEXPECTED_DATA_TYPES)
             raise UnexpectedResponseDataType(f'unexpected response data type {resp_payload[0]:#x}, expected {data_type:#x}')
-        return state_type.parse(resp_payload[1:])
+        state = REGISTRY.decode(resp_payload)
+        self.metrics.observe(metrics.STATE_PARSE, perf_counter() - parsed)
+        return state
+
+    async def _post(self, path: str, data: str) -> bytes:
+        self.metrics.increment(metrics.REQUESTS)
+        sent_at = time()
+        start = perf_counter()
+        try:
+            if self._transport is not None:
+                resp_bytes = await self._transport.post(path, data.encode())
+            else:
+                async with self._session.post(self._base_url + path, data=data, timeout=self._timeout) as resp:
+                    resp.raise_for_status()
+                    resp_bytes = await resp.read()
+        except Exception as err:
+            if self._recorder is not None:
+                await self._record_exchange(sent_at, path, data, KIND_ERROR, repr(err).encode())
+            raise
+        self.metrics.observe(metrics.HTTP_ROUNDTRIP, perf_counter() - start)
+        if self._recorder is not None:
+            # Requests are recorded together with their outcome, so that concurrent requests do not interleave
+            await self._record_exchange(sent_at, path, data, KIND_RESPONSE, resp_bytes)
+        return resp_bytes
 
-    async def _post_status_action_bytes(self, payload: bytes, line=1, n=None, m=None, t=None) -> bytes:
+    async def _record_exchange(self, sent_at: float, path: str, data: str, kind: int, response: bytes):
+        # A request does not fail because it could not be recorded
+        try:
+            await self._recorder.record_exchange(sent_at, path, data.encode(), kind, response)
+        except Exception:
+            _LOGGER.warning('Failed to record a request to %s', self._host, exc_info=True)
+
+    async def _post_status_action_bytes(self, payload: bytes, line=1, n=None, m=None, t=None,
+                                        priority=PRIORITY_POLL, merge_key=None) -> bytes:
         message = codec.format_message(payload)
-        resp_message = await self._post_status_action_raw(message, line=line, n=n, m=m, t=t)
+        resp_message = await self._post_status_action_raw(message, line=line, n=n, m=m, t=t, priority=priority,
+                                                          merge_key=merge_key)
         return codec.parse_message(resp_message)
 
-    async def _post_status_action_raw(self, message: str, line=1, n=None, m=None, t=None) -> str:
+    async def _post_status_action_raw(self, message: str, line=1, n=None, m=None, t=None, priority=PRIORITY_POLL,
+                                      merge_key=None) -> str:
         post_msg = f'group=Line&optionalGroupInstance={line}&action=Command '
         if n is not None:
             post_msg += f'n={n} '
@@ -103,19 +333,13 @@ class OfenInnovativAPIClient:
             post_msg += f't={t} '
         post_msg += message
 
-        async with self._session.post('/action/status', data=post_msg) as resp:
-            resp.raise_for_status()
-            resp_bytes = await resp.read()
-
-        root_elem = ET.XML(resp_bytes)
-        if root_elem.tag != 'function':
-            raise ResponseParseError(f'expected root element of response to have tag function, not {root_elem.tag}')
-        ret = root_elem.find('return')
-        if ret is None:
-            raise ResponseParseError(f'response did not contain a function return')
-        if (res := ret.findtext('result')) != 'Succeeded':
-            raise ResponseValueError(f'non-successful function result: {res}')
-
-        msg = ret.findtext('message')
+        future = self._line_queue.submit(lambda: self._post('/action/status', post_msg), priority, merge_key)
+        if priority == PRIORITY_WRITE:
+            # A write is still sent when its caller gives up on it
+            future = asyncio.shield(future)
+        resp_bytes = await future
 
-        return msg
+        start = perf_counter()
+        resp_message = responses.parse_action_message(resp_bytes)
+        self.metrics.observe(metrics.XML_PARSE, perf_counter() - start)
+        return resp_message
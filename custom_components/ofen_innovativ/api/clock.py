@@ -0,0 +1,98 @@
+from collections import deque
+from datetime import datetime, timedelta, tzinfo
+from typing import Deque, Optional, Tuple
+
+from .types import DateTimeInfo
+
+# The controller clock only has minute resolution and is truncated, so a reading lags the
+# actual clock by half a minute on average.
+_TRUNCATION_BIAS = 30.0
+
+# Drift is only estimated from samples spanning at least this many seconds, as the
+# truncation noise dominates over shorter periods.
+_MIN_DRIFT_SPAN = 3600.0
+
+# A sample deviating from the prediction by more than this many seconds means that the
+# clock was set or jumped (e.g. at a DST change), so that the previous samples no longer apply.
+_JUMP_THRESHOLD = 600.0
+
+
+def _local_wall_time(timestamp: float, tz: tzinfo) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz).replace(tzinfo=None)
+
+
+class ClockModel:
+    """Model of the controller clock, learned from occasional DateTimeInfo samples.
+
+    The controller keeps a local wall clock time. The model tracks the difference
+    between it and the local wall clock time of the given time zone, i.e. the offset,
+    along with the rate at which the offset changes, i.e. the drift. As both clocks are
+    compared as wall clock times, a controller clock that does not follow a DST change
+    shows up as an offset of an hour.
+    """
+
+    def __init__(self, tz: tzinfo, max_samples: int = 16):
+        self._tz = tz
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)
+        self.source: Optional[int] = None
+        self._offset = 0.0
+        self._drift = 0.0
+        self._reference = 0.0
+
+    @property
+    def has_samples(self) -> bool:
+        return bool(self._samples)
+
+    @property
+    def drift(self) -> float:
+        """Return the estimated drift, in seconds per second."""
+        return self._drift
+
+    def reset(self):
+        self._samples.clear()
+        self.source = None
+        self._offset = self._drift = self._reference = 0.0
+
+    def add_sample(self, timestamp: float, info: DateTimeInfo):
+        """Add the controller clock reading taken at the given UNIX timestamp."""
+        offset = (info.datetime - _local_wall_time(timestamp, self._tz)).total_seconds() + _TRUNCATION_BIAS
+        if self._samples and abs(offset - self.offset_at(timestamp)) > _JUMP_THRESHOLD:
+            self._samples.clear()
+        self._samples.append((timestamp, offset))
+        self.source = info.source
+        self._fit()
+
+    def _fit(self):
+        # Least squares fit of the offsets over time
+        n = len(self._samples)
+        mean_t = sum(t for t, _ in self._samples) / n
+        mean_offset = sum(offset for _, offset in self._samples) / n
+        span = self._samples[-1][0] - self._samples[0][0]
+        drift = 0.0
+        if span >= _MIN_DRIFT_SPAN:
+            var_t = sum((t - mean_t) ** 2 for t, _ in self._samples)
+            drift = sum((t - mean_t) * (offset - mean_offset) for t, offset in self._samples) / var_t
+        self._reference = mean_t
+        self._offset = mean_offset
+        self._drift = drift
+
+    def offset_at(self, timestamp: float) -> float:
+        """Return the estimated offset of the controller clock at the given UNIX timestamp, in seconds."""
+        return self._offset + self._drift * (timestamp - self._reference)
+
+    def controller_datetime(self, timestamp: float) -> Optional[datetime]:
+        """Return the time the controller clock shows at the given UNIX timestamp, in the model's time zone."""
+        if not self._samples:
+            return None
+        wall_time = _local_wall_time(timestamp, self._tz) + timedelta(seconds=self.offset_at(timestamp))
+        return wall_time.replace(second=0, microsecond=0, tzinfo=self._tz)
+
+    def needs_sync(self, timestamp: float, threshold: float, include_unset: bool = True) -> bool:
+        """Return whether the controller clock is off by more than threshold seconds, or (if include_unset) unset.
+
+        A controller without a time source keeps reporting its clock as unset after it has
+        been set, so callers that have set it pass include_unset=False.
+        """
+        if not self._samples:
+            return False
+        return (include_unset and self.source == 0) or abs(self.offset_at(timestamp)) > threshold
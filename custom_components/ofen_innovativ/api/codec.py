@@ -1,45 +1,63 @@
+import struct
+from typing import Iterable, List, Tuple
+
 _HEADER = b'\xaa\xcc\x33\x55'
+_HEADER_LEN = len(_HEADER)
+_CHECKSUM = struct.Struct('<H')
+_MAX_PAYLOAD_LEN = 0xff + 0xfe
+_MIN_FRAME_LEN = _HEADER_LEN + 1 + _CHECKSUM.size
 
 
-def _pack_data(payload: bytes) -> bytes:
-    packed_data = _HEADER
-    payload_len = len(payload)
-    if payload_len >= 0xff:
-        packed_data += b'\xff'
-        payload_len -= 0xff
-    if payload_len >= 0xff:
-        raise PayloadTooBigError(f'payload with {len(payload)} bytes is too long')
-    packed_data += payload_len.to_bytes(1, byteorder='little')
-    packed_data += payload
-    checksum = _calc_checksum(payload)
-    packed_data += checksum.to_bytes(2, byteorder='little')
-    return packed_data
+def _calc_checksum(data: bytes) -> int:
+    return sum(data) & 0xffff
 
 
-def _unpack_data(packed: bytes) -> bytes:
-    if not packed.startswith(_HEADER):
+def _pack_data(payload: bytes) -> bytearray:
+    payload_len = len(payload)
+    if payload_len > _MAX_PAYLOAD_LEN:
+        raise PayloadTooBigError(f'payload with {payload_len} bytes is too long')
+    packed = bytearray(_HEADER)
+    if payload_len >= 0xff:
+        packed.append(0xff)
+        packed.append(payload_len - 0xff)
+    else:
+        packed.append(payload_len)
+    packed += payload
+    packed += _CHECKSUM.pack(_calc_checksum(payload))
+    return packed
+
+
+def _unpack_from(packed: bytes, start: int, end: int) -> bytes:
+    """Validate the frame in packed[start:end] in place and return its payload."""
+    if not packed.startswith(_HEADER, start, end):
         raise MissingHeaderError('data does not start with magic header')
-    packed = packed[4:]
+    if end - start < _MIN_FRAME_LEN:
+        raise PayloadLengthMismatchError(f'message of {end - start} bytes is too short')
 
-    payload_len = int(packed[0])
-    packed = packed[1:]
+    payload_start = start + _HEADER_LEN + 1
+    payload_len = packed[payload_start - 1]
     if payload_len == 0xff:
-        payload_len += int(packed[0])
-        packed = packed[1:]
+        payload_len += packed[payload_start]
+        payload_start += 1
 
-    payload = packed[:-2]
-    if len(payload) != payload_len:
+    checksum_start = end - _CHECKSUM.size
+    if checksum_start - payload_start != payload_len:
         raise PayloadLengthMismatchError(f'message header indicated {payload_len} bytes of payload data, but ' +
-                                         f'actual payload is {len(payload)} bytes')
+                                         f'actual payload is {max(checksum_start - payload_start, 0)} bytes')
 
+    payload = packed[payload_start:checksum_start]
     calced_checksum = _calc_checksum(payload)
-    claimed_checksum = int.from_bytes(packed[-2:], byteorder='little')
+    claimed_checksum, = _CHECKSUM.unpack_from(packed, checksum_start)
     if calced_checksum != claimed_checksum:
         raise ChecksumValidationError(f'checksum mismatch: {calced_checksum:#x} vs. {claimed_checksum:#x}')
 
     return payload
 
 
+def _unpack_data(packed: bytes) -> bytes:
+    return _unpack_from(packed, 0, len(packed))
+
+
 def format_message(payload: bytes) -> str:
     return _pack_data(payload).hex()
 
@@ -48,8 +66,34 @@ def parse_message(message: str) -> bytes:
     return _unpack_data(bytes.fromhex(message))
 
 
-def _calc_checksum(data: bytes) -> int:
-    return sum(data) % 0x10000
+# Messages requesting data of a given type consist of nothing but the type byte, so
+# they are formatted once, up front.
+_REQUEST_MESSAGES: Tuple[str, ...] = tuple(format_message(bytes((data_type,))) for data_type in range(0x100))
+
+
+def format_request(data_type: int) -> str:
+    """Return the message requesting data of the given type."""
+    return _REQUEST_MESSAGES[data_type]
+
+
+def parse_messages(messages: Iterable[str]) -> List[bytes]:
+    """Parse many messages at once.
+
+    All messages are decoded from hex in a single pass, and the individual frames are
+    then validated in place in the decoded buffer.
+    """
+    messages = list(messages)
+    bounds = []
+    offset = 0
+    for message in messages:
+        if len(message) % 2 != 0:
+            raise ValueError(f'message {message!r} has an odd number of hex digits')
+        end = offset + len(message) // 2
+        bounds.append((offset, end))
+        offset = end
+
+    data = bytes.fromhex(''.join(messages))
+    return [_unpack_from(data, start, end) for start, end in bounds]
 
 
 class MissingHeaderError(BaseException):
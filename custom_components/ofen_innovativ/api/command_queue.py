@@ -0,0 +1,96 @@
+import asyncio
+import heapq
+import itertools
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from . import metrics
+
+PRIORITY_WRITE = 0
+PRIORITY_POLL = 1
+
+
+class _Command:
+    __slots__ = ('send', 'future', 'key', 'enqueued_at')
+
+    def __init__(self, send: Callable[[], Awaitable[Any]], future: 'asyncio.Future[Any]', key: Optional[Hashable]):
+        self.send = send
+        self.future = future
+        self.key = key
+        self.enqueued_at = perf_counter()
+
+
+class CommandQueue:
+    """Queue serializing the commands sent on the controller's line.
+
+    Commands are sent one at a time, those of higher priority (lower value) first, and
+    in the order of submission otherwise. A command submitted with a merge key replaces
+    the send function of a pending command with the same key, so that only the latest
+    of several pending writes of the same kind is sent; both submissions share a future.
+    Commands whose future has been cancelled before they are sent are skipped.
+
+    The time commands wait in the queue, the number of merged commands and the depth of
+    the queue are recorded in the given metrics.
+    """
+
+    def __init__(self, client_metrics: metrics.ClientMetrics):
+        self._heap: List[Tuple[int, int, _Command]] = []
+        self._pending: Dict[Hashable, _Command] = {}
+        self._counter = itertools.count()
+        self._metrics = client_metrics
+        self._worker: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def submit(self, send: Callable[[], Awaitable[Any]], priority: int = PRIORITY_POLL,
+               merge_key: Optional[Hashable] = None) -> 'asyncio.Future[Any]':
+        """Queue a command and return a future of its result."""
+        if merge_key is not None and (command := self._pending.get(merge_key)) is not None:
+            command.send = send
+            self._metrics.increment(metrics.MERGED_WRITES)
+            return command.future
+
+        loop = asyncio.get_running_loop()
+        command = _Command(send, loop.create_future(), merge_key)
+        if merge_key is not None:
+            self._pending[merge_key] = command
+        heapq.heappush(self._heap, (priority, next(self._counter), command))
+        self._metrics.set_gauge(metrics.QUEUE_DEPTH, len(self._heap))
+        if self._worker is None:
+            self._worker = loop.create_task(self._run())
+        return command.future
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for _, _, command in self._heap:
+            command.future.cancel()
+        self._heap.clear()
+        self._pending.clear()
+        self._metrics.set_gauge(metrics.QUEUE_DEPTH, 0)
+
+    async def _run(self):
+        try:
+            while self._heap:
+                _, _, command = heapq.heappop(self._heap)
+                self._metrics.set_gauge(metrics.QUEUE_DEPTH, len(self._heap))
+                if command.key is not None:
+                    del self._pending[command.key]
+                if command.future.done():
+                    continue
+                self._metrics.observe(metrics.QUEUE_WAIT, perf_counter() - command.enqueued_at)
+                try:
+                    result = await command.send()
+                except asyncio.CancelledError:
+                    command.future.cancel()
+                    raise
+                except Exception as err:
+                    if not command.future.done():
+                        command.future.set_exception(err)
+                else:
+                    if not command.future.done():
+                        command.future.set_result(result)
+        finally:
+            self._worker = None
@@ -0,0 +1,83 @@
+import asyncio
+import ipaddress
+from itertools import islice
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from aiohttp import ClientSession, TCPConnector
+
+from .client import OfenInnovativAPIClient
+
+# Controllers answer within a few hundred milliseconds on the LAN, and addresses without
+# a host take seconds to time out, so probes give up early.
+DEFAULT_PROBE_TIMEOUT = 0.8
+DEFAULT_CONCURRENCY = 128
+# Subnets larger than this many hosts are not scanned.
+MAX_SCAN_HOSTS = 1024
+
+
+class DiscoveredController(NamedTuple):
+    host: str
+    serial: str
+
+
+def serial_from_mac(mac_address: str) -> str:
+    """Return the serial of a controller, i.e. its MAC address in upper case, without separators."""
+    return mac_address.replace(':', '').replace('-', '').upper()
+
+
+async def probe(host: str, session: ClientSession, timeout: float = DEFAULT_PROBE_TIMEOUT
+                ) -> Optional[DiscoveredController]:
+    """Return the controller at host, or None if there is none.
+
+    The fingerprint of a controller is the MAC address in its /export/status response;
+    anything else answering there is not taken for one.
+    """
+    client = OfenInnovativAPIClient(host, session=session, request_timeout=timeout, retries=0)
+    try:
+        ip_status = await client.retrieve_ip_status()
+    except Exception:
+        return None
+    finally:
+        await client.close()
+    return DiscoveredController(host, serial_from_mac(ip_status.mac_address))
+
+
+def scan_hosts(network: str, port: Optional[int] = None) -> List[str]:
+    """Return the hosts of a subnet in CIDR notation (e.g. 192.168.1.0/24), with the port if given."""
+    # Only as many hosts as needed to tell that there are too many are listed, as listing
+    # all hosts of a large subnet (let alone an IPv6 one) takes long
+    hosts = list(islice(ipaddress.ip_network(network, strict=False).hosts(), MAX_SCAN_HOSTS + 1))
+    if len(hosts) > MAX_SCAN_HOSTS:
+        raise ValueError(f'{network} has more than {MAX_SCAN_HOSTS} hosts')
+    return [str(host) if port is None else f'{host}:{port}' for host in hosts]
+
+
+async def scan(hosts: Iterable[str], session: Optional[ClientSession] = None,
+               concurrency: int = DEFAULT_CONCURRENCY,
+               timeout: float = DEFAULT_PROBE_TIMEOUT) -> List[DiscoveredController]:
+    """Probe the hosts concurrently and return the controllers found, one per serial.
+
+    At most concurrency probes are in flight at any time, so that scanning a /24 takes
+    about 256 / concurrency * timeout seconds at worst. Without a session, a session of
+    its own is used, with connections closed right after each probe.
+    """
+    owns_session = session is None
+    if owns_session:
+        session = ClientSession(connector=TCPConnector(limit=concurrency, force_close=True))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded_probe(host: str) -> Optional[DiscoveredController]:
+        async with semaphore:
+            return await probe(host, session, timeout)
+
+    try:
+        results = await asyncio.gather(*(bounded_probe(host) for host in hosts))
+    finally:
+        if owns_session:
+            await session.close()
+
+    controllers: Dict[str, DiscoveredController] = {}
+    for controller in results:
+        if controller is not None:
+            controllers.setdefault(controller.serial, controller)
+    return list(controllers.values())
@@ -9,3 +9,11 @@ class ResponseValueError(Exception):
 
 class UnexpectedResponseDataType(ResponseValueError):
     pass
+
+
+class UnexpectedHTTPStatus(ResponseValueError):
+    pass
+
+
+class CircuitOpenError(ConnectionError):
+    pass
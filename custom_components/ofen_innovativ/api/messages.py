@@ -0,0 +1,184 @@
+import dataclasses
+import keyword
+import struct
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .errors import UnexpectedResponseDataType
+
+_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+_BYTEORDERS = {'big': '>', 'little': '<'}
+
+
+class Field(NamedTuple):
+    """A value decoded from bytes at a fixed offset of the payload.
+
+    The raw value is an unsigned (or signed) integer of the given width and byte order, or,
+    with base, a number whose digits are the individual bytes, most significant first
+    (e.g. hours and minutes with base 60). It is then shifted right, masked and added to,
+    in that order. Values above offset_above[0] are reduced by offset_above[1]. Finally,
+    the value can be turned into a flag, telling whether it is above the given value or
+    one of the given values.
+    """
+    name: str
+    offset: int
+    width: int = 1
+    byteorder: str = 'big'
+    signed: bool = False
+    base: Optional[int] = None
+    shift: int = 0
+    mask: Optional[int] = None
+    add: int = 0
+    offset_above: Optional[Tuple[int, int]] = None
+    above: Optional[int] = None
+    values: Optional[FrozenSet[int]] = None
+
+
+class Compose(NamedTuple):
+    """A value computed by a function from previously declared values, e.g. a datetime from its parts."""
+    name: str
+    function: Callable[..., Any]
+    args: Tuple[str, ...]
+
+
+Decoder = Callable[..., Any]
+
+
+def _check_name(name: str):
+    if not name.isidentifier() or keyword.iskeyword(name) or name.startswith('_') or name in ('payload', 'start'):
+        raise ValueError(f'invalid field name {name!r}')
+
+
+def compile_decoder(cls: type, layout: Sequence[Union[Field, Compose]], exact_size: bool = False) -> Decoder:
+    """Compile the layout of a message into a decoder(payload, start=0) constructing cls.
+
+    All slots of the payload are unpacked with one precompiled struct per byte order, and
+    the values are computed by generated code, so that decoding costs about the same as
+    hand-written slicing. Values that are not fields of the dataclass cls are only
+    available to Compose entries.
+    """
+    namespace: Dict[str, Any] = {'_cls': cls}
+    slots: Dict[Tuple[int, int, str, bool], str] = {}
+
+    def slot(offset: int, width: int, byteorder: str, signed: bool) -> str:
+        if width not in _FORMATS or byteorder not in _BYTEORDERS:
+            raise ValueError(f'unsupported width {width} or byte order {byteorder!r}')
+        return slots.setdefault((offset, 1 if width == 1 else width, byteorder if width > 1 else 'big', signed),
+                                f'_{len(slots)}')
+
+    lines: List[str] = []
+    names = set()
+    for entry in layout:
+        _check_name(entry.name)
+        if isinstance(entry, Compose):
+            unknown = [arg for arg in entry.args if arg not in names]
+            if unknown:
+                raise ValueError(f'{entry.name} depends on undeclared values {unknown}')
+            function_name = f'_f{len(namespace)}'
+            namespace[function_name] = entry.function
+            lines.append(f'{entry.name} = {function_name}({", ".join(entry.args)})')
+        else:
+            if entry.base is not None:
+                digits = [slot(entry.offset + i, 1, 'big', False) for i in range(entry.width)]
+                value = digits[0]
+                for digit in digits[1:]:
+                    value = f'{value} * {entry.base} + {digit}'
+            else:
+                value = slot(entry.offset, entry.width, entry.byteorder, entry.signed)
+            if entry.shift:
+                value = f'({value}) >> {entry.shift}'
+            if entry.mask is not None:
+                value = f'({value}) & {entry.mask:#x}'
+            if entry.add:
+                value = f'({value}) + {entry.add}'
+            if entry.offset_above is not None:
+                threshold, amount = entry.offset_above
+                value = f'({value}) - {amount} if ({value}) > {threshold} else ({value})'
+            if entry.above is not None:
+                value = f'({value}) > {entry.above}'
+            elif entry.values is not None:
+                constant = f'_c{len(namespace)}'
+                namespace[constant] = frozenset(entry.values)
+                value = f'({value}) in {constant}'
+            lines.append(f'{entry.name} = {value}')
+        names.add(entry.name)
+
+    args = [field.name for field in dataclasses.fields(cls)]
+    missing = [name for name in args if name not in names]
+    if missing:
+        raise ValueError(f'layout of {cls.__name__} does not declare {missing}')
+
+    # Slots may be shared by several values, but must not overlap otherwise
+    ordered = sorted(slots.items())
+    for ((offset, width, _, _), _), ((next_offset, _, _, _), _) in zip(ordered, ordered[1:]):
+        if next_offset < offset + width:
+            raise ValueError(f'overlapping slots at offsets {offset} and {next_offset}')
+    size = max((offset + width for (offset, width, _, _) in slots), default=0)
+
+    unpack_lines = []
+    for byteorder, prefix in _BYTEORDERS.items():
+        group = [(key, var) for key, var in ordered if key[2] == byteorder]
+        if not group:
+            continue
+        fmt = prefix
+        position = 0
+        for (offset, width, _, signed), _ in group:
+            fmt += 'x' * (offset - position) + (_FORMATS[width].lower() if signed else _FORMATS[width])
+            position = offset + width
+        struct_name = f'_s{len(namespace)}'
+        namespace[struct_name] = struct.Struct(fmt).unpack_from
+        unpack_lines.append(f'{", ".join(var for _, var in group)}, = {struct_name}(payload, start)')
+
+    if exact_size:
+        check = (f'if len(payload) - start != {size}: raise ValueError('
+                 f'f"payload has unexpected length {{len(payload) - start}}, expected {size} bytes")')
+    else:
+        check = (f'if len(payload) - start < {size}: raise ValueError('
+                 f'f"not enough bytes in payload: got {{len(payload) - start}}, expected at least {size} bytes")')
+    # Positional arguments, as keyword arguments noticeably slow down the frozen __init__
+    source = '\n    '.join([
+        'def decode(payload, start=0):',
+        check,
+        *unpack_lines,
+        *lines,
+        f'return _cls({", ".join(args)})',
+    ])
+    exec(compile(source, f'<decoder of {cls.__name__}>', 'exec'), namespace)
+    decode = namespace['decode']
+    decode.__qualname__ = f'{cls.__name__}.parse'
+    return decode
+
+
+class MessageRegistry:
+    """Decoders of the message types, dispatched on the data type byte of a payload."""
+
+    def __init__(self):
+        self._decoders: List[Optional[Decoder]] = [None] * 256
+        self.types: Dict[int, type] = {}
+        self.layouts: Dict[int, Tuple[Tuple[Union[Field, Compose], ...], bool]] = {}
+
+    def message(self, *layout: Union[Field, Compose], exact_size: bool = False) -> Callable[[type], type]:
+        """Class decorator registering a dataclass with a DATA_TYPE under the given layout.
+
+        The compiled decoder becomes the parse(payload, start=0) method of the class.
+        """
+        def register(cls: type) -> type:
+            data_type = cls.DATA_TYPE
+            if self._decoders[data_type] is not None:
+                raise ValueError(f'data type {data_type:#x} is already registered to {self.types[data_type].__name__}')
+            decode = compile_decoder(cls, layout, exact_size=exact_size)
+            cls.parse = staticmethod(decode)
+            self._decoders[data_type] = decode
+            self.types[data_type] = cls
+            self.layouts[data_type] = (layout, exact_size)
+            return cls
+        return register
+
+    def decode(self, payload: bytes) -> Any:
+        """Decode a payload, starting with its data type byte."""
+        decode = self._decoders[payload[0]]
+        if decode is None:
+            raise UnexpectedResponseDataType(f'unknown response data type {payload[0]:#x}')
+        return decode(payload, 1)
+
+
+REGISTRY = MessageRegistry()
@@ -0,0 +1,100 @@
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Sequence
+
+# Upper bounds of the histogram buckets, in seconds. Observations above the last bound
+# fall into an overflow bucket.
+DEFAULT_BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                  5.0, 10.0)
+
+HTTP_ROUNDTRIP = 'http_roundtrip'
+XML_PARSE = 'xml_parse'
+MESSAGE_PARSE = 'message_parse'
+STATE_PARSE = 'state_parse'
+FANOUT = 'fanout'
+QUEUE_WAIT = 'queue_wait'
+
+REQUESTS = 'requests'
+RETRIES = 'retries'
+FAILURES = 'failures'
+CHECKSUM_FAILURES = 'checksum_failures'
+UNEXPECTED_DATA_TYPES = 'unexpected_data_types'
+CIRCUIT_REJECTIONS = 'circuit_rejections'
+MERGED_WRITES = 'merged_writes'
+
+QUEUE_DEPTH = 'queue_depth'
+
+
+class Histogram:
+    """Histogram of durations with fixed buckets, taking constant memory."""
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS):
+        self.bounds = tuple(bounds)
+        self._counts = array('Q', bytes(8 * (len(self.bounds) + 1)))
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self._counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Return an upper bound of the q-quantile, i.e., the upper bound of the bucket it falls into.
+
+        The overflow bucket is bounded by the largest observation, so that quantiles beyond
+        the last bound are not under-reported.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self._counts):
+            cumulative += count
+            if cumulative >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'bounds': list(self.bounds),
+            'buckets': self._counts.tolist(),
+        }
+
+
+class ClientMetrics:
+    """Timings of the stages of a request, counters of requests and errors, and gauges, for a single controller."""
+
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {
+            name: Histogram() for name in (HTTP_ROUNDTRIP, XML_PARSE, MESSAGE_PARSE, STATE_PARSE, FANOUT, QUEUE_WAIT)
+        }
+        self.counters: Dict[str, int] = dict.fromkeys(
+            (REQUESTS, RETRIES, FAILURES, CHECKSUM_FAILURES, UNEXPECTED_DATA_TYPES, CIRCUIT_REJECTIONS, MERGED_WRITES),
+            0)
+        self.gauges: Dict[str, int] = {QUEUE_DEPTH: 0}
+
+    def observe(self, name: str, seconds: float):
+        self.histograms[name].observe(seconds)
+
+    def increment(self, name: str):
+        self.counters[name] += 1
+
+    def set_gauge(self, name: str, value: int):
+        self.gauges[name] = value
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+            'histograms': {name: histogram.as_dict() for name, histogram in self.histograms.items()},
+        }
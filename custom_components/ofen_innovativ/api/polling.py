@@ -0,0 +1,37 @@
+from typing import Optional
+
+from .types import FireplaceState
+
+
+class AdaptivePollPolicy:
+    """Derives the poll interval from the most recently observed fireplace state.
+
+    The fireplace is polled at the active rate while a fire is burning, and at the idle
+    rate when it is out. A rising edge of the door or shutter movement flag starts a
+    short burst during which the fireplace is polled at the burst rate. All intervals
+    are in seconds.
+    """
+
+    def __init__(self, burst_interval: float, active_interval: float, idle_interval: float,
+                 burst_duration: float = 30.0):
+        if not 0 < burst_interval <= active_interval <= idle_interval:
+            raise ValueError('poll intervals must satisfy 0 < burst <= active <= idle')
+        self.burst_interval = burst_interval
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.burst_duration = burst_duration
+        self._last_state: Optional[FireplaceState] = None
+        self._burst_until = 0.0
+
+    def update(self, state: FireplaceState, now: float) -> float:
+        """Record a newly polled state and return the interval until the next poll."""
+        last = self._last_state
+        if last is not None and ((state.door and not last.door) or (state.movement and not last.movement)):
+            self._burst_until = now + self.burst_duration
+        self._last_state = state
+
+        if now < self._burst_until:
+            return self.burst_interval
+        if state.phase != 0 or state.door or state.movement:
+            return self.active_interval
+        return self.idle_interval
@@ -0,0 +1,151 @@
+import asyncio
+import mmap
+import os
+import struct
+from time import time
+from typing import Iterator, NamedTuple, Optional
+
+# A log file starts with a header of the magic bytes and the offset of the end of the
+# last record, followed by the records. Each record is a header of the UNIX timestamp,
+# the kind of record, the endpoint and the length of the data, followed by the data.
+_MAGIC = b'OIR1'
+_FILE_HEADER = struct.Struct('<4sI')
+_RECORD_HEADER = struct.Struct('<dBBI')
+
+KIND_REQUEST = 0
+KIND_RESPONSE = 1
+KIND_ERROR = 2
+
+_PATHS = ('/action/status', '/export/status')
+_PATH_CODES = {path: code for code, path in enumerate(_PATHS)}
+
+
+class Record(NamedTuple):
+    timestamp: float
+    kind: int
+    path: str
+    data: bytes
+
+
+class ProtocolRecorder:
+    """Append-only binary log of the raw requests and responses exchanged with a controller.
+
+    The log is written to a memory-mapped file of max_bytes, so that recording a message
+    is a copy into memory. When the next record does not fit, the file is rotated: it is
+    renamed with the suffix .1 (moving existing backups up to the given number of
+    backups), and a new file is started. An existing file is rotated when the recorder
+    is opened. Rotating and closing the log write back the whole file, so they are done in
+    the default executor of the event loop.
+    """
+
+    _rotation: Optional['asyncio.Future[None]']
+
+    def __init__(self, path: str, max_bytes: int = 4 * 1024 * 1024, backups: int = 3):
+        if max_bytes <= _FILE_HEADER.size + _RECORD_HEADER.size:
+            raise ValueError(f'max_bytes {max_bytes} is too small')
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = None
+        self._mmap = None
+        self._end = 0
+        self._rotation = None
+        self._open()
+
+    def _open(self):
+        if os.path.exists(self.path):
+            self._rotate()
+        self._file = open(self.path, 'w+b')
+        self._file.truncate(self.max_bytes)
+        self._mmap = mmap.mmap(self._file.fileno(), self.max_bytes)
+        self._end = _FILE_HEADER.size
+        _FILE_HEADER.pack_into(self._mmap, 0, _MAGIC, self._end)
+
+    def _rotate(self):
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f'{self.path}.{i}'):
+                os.replace(f'{self.path}.{i}', f'{self.path}.{i + 1}')
+        os.replace(self.path, f'{self.path}.1')
+
+    def _reopen(self):
+        self.close()
+        self._open()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            # Cut off the unused part of the file
+            self._file.truncate(self._end)
+            self._file.close()
+            self._file = None
+
+    async def _rotation_done(self):
+        # The rotation is not cancelled along with a cancelled waiter, nor do its errors propagate
+        while self._rotation is not None and not self._rotation.done():
+            await asyncio.wait([self._rotation])
+
+    async def aclose(self):
+        """Close the log in the default executor, once a rotation in progress is done."""
+        await self._rotation_done()
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def record_exchange(self, sent_at: float, path: str, request: bytes, kind: int, response: bytes):
+        """Append a request and its response (or error), rotating the log if they do not fit.
+
+        Both records go into the same file, so that every file can be replayed on its own.
+        Records wait for a rotation in progress to complete.
+        """
+        received_at = time()
+        size = 2 * _RECORD_HEADER.size + len(request) + len(response)
+        if _FILE_HEADER.size + size > self.max_bytes:
+            raise ValueError(f'records of {size} bytes exceed the log size')
+        await self._rotation_done()
+        while self._end + size > self.max_bytes:
+            self._rotation = asyncio.get_running_loop().run_in_executor(None, self._reopen)
+            await asyncio.shield(self._rotation)
+            # Records waiting for the rotation may have been appended in the meantime
+            await self._rotation_done()
+        self._append(sent_at, KIND_REQUEST, path, request)
+        self._append(received_at, kind, path, response)
+        _FILE_HEADER.pack_into(self._mmap, 0, _MAGIC, self._end)
+
+    def _append(self, timestamp: float, kind: int, path: str, data: bytes):
+        end = self._end
+        buf = self._mmap
+        _RECORD_HEADER.pack_into(buf, end, timestamp, kind, _PATH_CODES[path], len(data))
+        start = end + _RECORD_HEADER.size
+        buf[start:start + len(data)] = data
+        self._end = start + len(data)
+
+
+def read_records(path: str) -> Iterator[Record]:
+    """Read the records of a log file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, end = _FILE_HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError(f'{path} is not a protocol log')
+    pos = _FILE_HEADER.size
+    while pos < end:
+        timestamp, kind, path_code, length = _RECORD_HEADER.unpack_from(data, pos)
+        pos += _RECORD_HEADER.size
+        yield Record(timestamp, kind, _PATHS[path_code], data[pos:pos + length])
+        pos += length
+
+
+def log_files(path: str) -> Iterator[str]:
+    """Return the existing files of a rotated log, oldest first."""
+    backups = []
+    i = 1
+    while os.path.exists(f'{path}.{i}'):
+        backups.append(f'{path}.{i}')
+        i += 1
+    yield from reversed(backups)
+    if os.path.exists(path):
+        yield path
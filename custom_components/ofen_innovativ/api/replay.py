@@ -0,0 +1,60 @@
+import asyncio
+from collections import defaultdict, deque
+from time import monotonic
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from .recorder import KIND_ERROR, KIND_REQUEST, KIND_RESPONSE, Record
+
+
+class ReplayExhausted(Exception):
+    pass
+
+
+class ReplayTransport:
+    """Transport answering requests with the responses of a recorded protocol log.
+
+    It can be passed to OfenInnovativAPIClient in place of a connection to a controller.
+    Each request is answered with the next recorded response to an identical request, so
+    that the replay does not depend on the order in which concurrent requests are made.
+    Recorded errors are raised as ConnectionError. Without a speed, responses are served
+    as fast as they are requested; otherwise, each response is delayed until the time it
+    was recorded at, relative to the start of the replay and scaled by the speed.
+    """
+
+    def __init__(self, records: Iterable[Record], speed: Optional[float] = None):
+        self._speed = speed
+        self._responses: Dict[Tuple[str, bytes], Deque[Tuple[float, int, bytes]]] = defaultdict(deque)
+        self._start: Optional[float] = None
+        self._first_timestamp: Optional[float] = None
+        self.remaining = 0
+
+        requests: Dict[str, Deque[bytes]] = defaultdict(deque)
+        for record in records:
+            if self._first_timestamp is None:
+                self._first_timestamp = record.timestamp
+            if record.kind == KIND_REQUEST:
+                requests[record.path].append(record.data)
+            elif record.kind in (KIND_RESPONSE, KIND_ERROR) and requests[record.path]:
+                # The controller answers one request at a time, so responses come in the order of the requests
+                request = requests[record.path].popleft()
+                self._responses[(record.path, request)].append((record.timestamp, record.kind, record.data))
+                self.remaining += 1
+
+    async def post(self, path: str, body: bytes) -> bytes:
+        responses = self._responses.get((path, body))
+        if not responses:
+            raise ReplayExhausted(f'no more recorded responses to {path} {body!r}')
+        timestamp, kind, data = responses.popleft()
+        self.remaining -= 1
+        if self._speed is not None:
+            if self._start is None:
+                self._start = monotonic()
+            delay = (timestamp - self._first_timestamp) / self._speed - (monotonic() - self._start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if kind == KIND_ERROR:
+            raise ConnectionError(f'recorded error: {data.decode(errors="replace")}')
+        return data
+
+    async def close(self):
+        pass
@@ -0,0 +1,79 @@
+import asyncio
+import random
+from typing import Optional
+
+from aiohttp import ClientError
+
+from . import codec
+from .errors import CircuitOpenError, UnexpectedHTTPStatus
+
+# Errors that may go away by themselves when a request is repeated. Note that the codec
+# errors are not Exception subclasses.
+TRANSIENT_ERRORS = (
+    ClientError,
+    asyncio.TimeoutError,
+    OSError,
+    UnexpectedHTTPStatus,
+    codec.MissingHeaderError,
+    codec.PayloadLengthMismatchError,
+    codec.ChecksumValidationError,
+)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Return the delay before the given retry attempt (counting from 0), with full jitter."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Circuit breaker for the requests to a single controller.
+
+    The circuit opens after failure_threshold consecutive failures, after which requests
+    fail immediately with CircuitOpenError. Once reset_timeout has elapsed, a single
+    request is let through as a probe: if it succeeds the circuit closes again, and if
+    it fails the circuit stays open for twice as long, up to max_reset_timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 15.0, max_reset_timeout: float = 600.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._failures = 0
+        self._open_until: Optional[float] = None
+        self._open_for = reset_timeout
+        self._probing = False
+
+    @property
+    def is_closed(self) -> bool:
+        return self._open_until is None
+
+    def acquire(self, now: float) -> bool:
+        """Admit a request, and return whether it is the probe of an open circuit.
+
+        Raises CircuitOpenError if the request is not admitted.
+        """
+        if self._open_until is None:
+            return False
+        if self._probing or now < self._open_until:
+            raise CircuitOpenError(f'circuit open, retrying in {max(0.0, self._open_until - now):.0f} s')
+        self._probing = True
+        return True
+
+    def release(self):
+        """Release the probe admitted by acquire without recording an outcome."""
+        self._probing = False
+
+    def record_success(self):
+        self._failures = 0
+        self._open_until = None
+        self._open_for = self.reset_timeout
+        self._probing = False
+
+    def record_failure(self, now: float):
+        self._failures += 1
+        if self._probing:
+            self._probing = False
+            self._open_for = min(self._open_for * 2, self.max_reset_timeout)
+            self._open_until = now + self._open_for
+        elif self._open_until is None and self._failures >= self.failure_threshold:
+            self._open_until = now + self._open_for
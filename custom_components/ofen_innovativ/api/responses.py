@@ -0,0 +1,152 @@
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+from .errors import (
+    ResponseParseError,
+    ResponseValueError,
+)
+
+# The responses of the controller are parsed with byte-level scanners that only look
+# at the needed fields and the markup around them. Whenever a scanner encounters
+# anything unexpected, the response is parsed in full instead, which also takes care
+# of reporting errors.
+
+_STATUSRECORD_START = b'<statusrecord>'
+_WLAN0_GROUP_START = b'<statusgroup name="Interface" instance="wlan0">'
+_STATUSGROUP_END = b'</statusgroup>'
+_MAC_ITEM_START = b'<statusitem name="MAC Address">'
+_STATUSITEM_END = b'</statusitem>'
+_VALUE_START = b'<value>'
+_VALUE_END = b'</value>'
+
+_FUNCTION_START = b'<function>'
+_RETURN_START = b'<return>'
+_RETURN_END = b'</return>'
+_RESULT_SUCCEEDED = b'<result>Succeeded</result>'
+_MESSAGE_START = b'<message>'
+_MESSAGE_END = b'</message>'
+
+
+def parse_mac_address(resp_bytes: bytes) -> str:
+    """Return the MAC address of the wlan0 interface from a /export/status response."""
+    mac_addr = _scan_mac_address(resp_bytes)
+    if mac_addr is None:
+        mac_addr = _parse_mac_address_full(resp_bytes)
+    return mac_addr
+
+
+def parse_action_message(resp_bytes: bytes) -> Optional[str]:
+    """Return the message returned by a successful /action/status function call."""
+    msg = _scan_action_message(resp_bytes)
+    if msg is None:
+        msg = _parse_action_message_full(resp_bytes)
+    return msg
+
+
+def _scan_mac_address(resp_bytes: bytes) -> Optional[str]:
+    start = _skip_xml_declaration(resp_bytes)
+    if start is None or not resp_bytes.startswith(_STATUSRECORD_START, start):
+        return None
+    group_start = resp_bytes.find(_WLAN0_GROUP_START, start)
+    if group_start < 0:
+        return None
+    group_end = resp_bytes.find(_STATUSGROUP_END, group_start)
+    item_start = resp_bytes.find(_MAC_ITEM_START, group_start, group_end)
+    if group_end < 0 or item_start < 0:
+        return None
+    start = _skip_whitespace(resp_bytes, item_start + len(_MAC_ITEM_START))
+    if not resp_bytes.startswith(_VALUE_START, start):
+        return None
+    start += len(_VALUE_START)
+    end = resp_bytes.find(_VALUE_END, start, group_end)
+    if end < 0:
+        return None
+    if not resp_bytes.startswith(_STATUSITEM_END, _skip_whitespace(resp_bytes, end + len(_VALUE_END))):
+        return None
+    return _decode_text(resp_bytes[start:end])
+
+
+def _parse_mac_address_full(resp_bytes: bytes) -> str:
+    root_elem = ET.XML(resp_bytes)
+    mac_addr = None
+    if root_elem.tag != 'statusrecord':
+        raise ResponseParseError(f'expected root element of response to have tag statusrecord, not {root_elem.tag}')
+    for sg in root_elem:
+        if mac_addr is not None:
+            break
+        if sg.tag != 'statusgroup' or sg.get('name') != 'Interface' or sg.get('instance') != 'wlan0':
+            continue
+        for si in sg:
+            if si.tag != 'statusitem' or si.get('name') != 'MAC Address':
+                continue
+            mac_addr = si.findtext('value')
+            break
+
+    if mac_addr is None:
+        raise ResponseValueError('response contained no MAC address')
+
+    return mac_addr
+
+
+def _scan_action_message(resp_bytes: bytes) -> Optional[str]:
+    start = _skip_xml_declaration(resp_bytes)
+    if start is None:
+        return None
+    # Expect exactly <function><return><result>Succeeded</result><message>...</message></return></function>,
+    # with nothing but whitespace between the tags
+    if not resp_bytes.startswith(_FUNCTION_START, start):
+        return None
+    start = _skip_whitespace(resp_bytes, start + len(_FUNCTION_START))
+    if not resp_bytes.startswith(_RETURN_START, start):
+        return None
+    start = _skip_whitespace(resp_bytes, start + len(_RETURN_START))
+    if not resp_bytes.startswith(_RESULT_SUCCEEDED, start):
+        return None
+    start = _skip_whitespace(resp_bytes, start + len(_RESULT_SUCCEEDED))
+    if not resp_bytes.startswith(_MESSAGE_START, start):
+        return None
+    start += len(_MESSAGE_START)
+    end = resp_bytes.find(_MESSAGE_END, start)
+    if end < 0:
+        return None
+    if not resp_bytes.startswith(_RETURN_END, _skip_whitespace(resp_bytes, end + len(_MESSAGE_END))):
+        return None
+    return _decode_text(resp_bytes[start:end])
+
+
+def _skip_xml_declaration(data: bytes) -> Optional[int]:
+    if not data.startswith(b'<?xml'):
+        return _skip_whitespace(data, 0)
+    end = data.find(b'?>')
+    if end < 0:
+        return None
+    return _skip_whitespace(data, end + 2)
+
+
+def _decode_text(text: bytes) -> Optional[str]:
+    # Markup or entity references within the text call for a real parser
+    if b'<' in text or b'&' in text:
+        return None
+    try:
+        return text.decode('ascii')
+    except UnicodeDecodeError:
+        return None
+
+
+def _skip_whitespace(data: bytes, pos: int) -> int:
+    while pos < len(data) and data[pos] in b' \t\r\n':
+        pos += 1
+    return pos
+
+
+def _parse_action_message_full(resp_bytes: bytes) -> Optional[str]:
+    root_elem = ET.XML(resp_bytes)
+    if root_elem.tag != 'function':
+        raise ResponseParseError(f'expected root element of response to have tag function, not {root_elem.tag}')
+    ret = root_elem.find('return')
+    if ret is None:
+        raise ResponseParseError(f'response did not contain a function return')
+    if (res := ret.findtext('result')) != 'Succeeded':
+        raise ResponseValueError(f'non-successful function result: {res}')
+
+    return ret.findtext('message')
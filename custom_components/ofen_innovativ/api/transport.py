@@ -0,0 +1,151 @@
+import asyncio
+from typing import Optional, Tuple
+
+from .errors import ResponseParseError, UnexpectedHTTPStatus
+
+
+_DEFAULT_PORT = 80
+_MAX_HEADER_BYTES = 16 * 1024
+
+
+def _split_host_port(host: str) -> Tuple[str, int]:
+    hostname, sep, port = host.rpartition(':')
+    if sep and port.isdigit() and not hostname.endswith(':'):
+        return hostname.strip('[]'), int(port)
+    return host, _DEFAULT_PORT
+
+
+class StreamTransport:
+    """Minimal HTTP/1.1 client for the web server of a fireplace controller.
+
+    Requests are sent over a single persistent connection, with request headers that
+    are prebuilt per path, and responses are read with a parser that only understands
+    what the controller actually sends: a status line, a handful of headers and a body
+    delimited by Content-Length, chunked encoding or the end of the connection.
+
+    Requests are serialized, as the controller processes one request at a time anyway.
+    """
+
+    def __init__(self, host: str, timeout: float = 10.0):
+        self._host = host
+        self._hostname, self._port = _split_host_port(host)
+        self._timeout = timeout
+        self._lock = asyncio.Lock()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._request_heads = {}
+
+    async def close(self):
+        async with self._lock:
+            await self._disconnect()
+
+    async def post(self, path: str, body: bytes) -> bytes:
+        """Send a POST request and return the response body."""
+        head = self._request_heads.get(path)
+        if head is None:
+            head = self._request_heads[path] = (
+                f'POST {path} HTTP/1.1\r\n'
+                f'Host: {self._host}\r\n'
+                'Content-Type: text/plain; charset=utf-8\r\n'
+                'Connection: keep-alive\r\n'
+                'Content-Length: '
+            ).encode('ascii')
+        request = b'%s%d\r\n\r\n%s' % (head, len(body), body)
+
+        async with self._lock:
+            reused = self._writer is not None
+            try:
+                return await asyncio.wait_for(self._roundtrip(request), self._timeout)
+            except ConnectionError:
+                await self._disconnect()
+                if not reused:
+                    raise
+            except BaseException:
+                await self._disconnect()
+                raise
+            # The controller may have closed an idle keep-alive connection in the
+            # meantime, so retry once on a fresh connection
+            try:
+                return await asyncio.wait_for(self._roundtrip(request), self._timeout)
+            except BaseException:
+                await self._disconnect()
+                raise
+
+    async def _roundtrip(self, request: bytes) -> bytes:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self._hostname, self._port)
+        self._writer.write(request)
+        await self._writer.drain()
+        try:
+            return await self._read_response()
+        except asyncio.IncompleteReadError as e:
+            raise ConnectionResetError('connection closed by the controller') from e
+
+    async def _read_response(self) -> bytes:
+        reader = self._reader
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.LimitOverrunError:
+            raise ResponseParseError('response headers too long')
+        if len(head) > _MAX_HEADER_BYTES:
+            raise ResponseParseError('response headers too long')
+
+        status_line, *header_lines = head[:-4].split(b'\r\n')
+        parts = status_line.split(b' ', 2)
+        if len(parts) < 2 or not parts[0].startswith(b'HTTP/1.') or not parts[1].isdigit():
+            raise ResponseParseError(f'malformed status line {status_line!r}')
+        status = int(parts[1])
+        keep_alive = parts[0] != b'HTTP/1.0'
+
+        content_length = None
+        chunked = False
+        for line in header_lines:
+            name, sep, value = line.partition(b':')
+            if not sep:
+                raise ResponseParseError(f'malformed header line {line!r}')
+            name = name.strip().lower()
+            value = value.strip().lower()
+            if name == b'content-length':
+                content_length = int(value)
+            elif name == b'transfer-encoding':
+                chunked = value.endswith(b'chunked')
+            elif name == b'connection':
+                keep_alive = value == b'keep-alive' or (keep_alive and value != b'close')
+
+        if chunked:
+            body = await self._read_chunked()
+        elif content_length is not None:
+            body = await reader.readexactly(content_length)
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        if not keep_alive:
+            await self._disconnect()
+        if status >= 400:
+            raise UnexpectedHTTPStatus(f'unexpected HTTP status {status}')
+        return body
+
+    async def _read_chunked(self) -> bytes:
+        reader = self._reader
+        chunks = []
+        while True:
+            size_line = await reader.readuntil(b'\r\n')
+            size = int(size_line.split(b';', 1)[0], 16)
+            if size == 0:
+                # Skip trailers
+                while await reader.readuntil(b'\r\n') != b'\r\n':
+                    pass
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    async def _disconnect(self):
+        writer = self._writer
+        self._reader = self._writer = None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
@@ -2,13 +2,40 @@ from datetime import datetime
 from dataclasses import dataclass
 from typing import ClassVar
 
-@dataclass
+from .messages import REGISTRY, Compose, Field
+
+# The state types are immutable and slotted, so that they are small, hashable and
+# cheap to compare. Two polls that yield equal states can be recognized with ==.
+#
+# Messages are declared by the layout of their payload, following the data type byte,
+# which is compiled into their parse(payload, start=0) method.
+
+
+@dataclass(frozen=True)
 class IPStatus:
+    __slots__ = ('mac_address',)
+
     mac_address: str
 
 
-@dataclass
+@REGISTRY.message(
+    Field('phase', 0, mask=0x0f),
+    Field('door', 0, shift=4, values=frozenset({1, 3})),
+    Field('temperature', 1, width=2),
+    # The shutter position is offset by 150 while the shutter moves
+    Field('shutter', 3, offset_above=(100, 150)),
+    Field('movement', 3, above=100),
+    Field('burn_time_mins', 4, width=2, base=60),
+    Field('alarm1', 6),
+    Field('hood', 7),
+    Field('alarm2', 8),
+    Field('position', 9),
+)
+@dataclass(frozen=True)
 class FireplaceState:
+    __slots__ = ('phase', 'door', 'temperature', 'shutter', 'movement', 'burn_time_mins', 'hood', 'position',
+                 'alarm1', 'alarm2')
+
     phase: int
     door: bool
     temperature: int
@@ -22,70 +49,30 @@ class FireplaceState:
 
     DATA_TYPE: ClassVar[int] = 0x00
 
-    @classmethod
-    def parse(cls, untyped_payload: bytes) -> 'FireplaceState':
-        if len(untyped_payload) < 10:
-            raise ValueError(f'not enough bytes in payload: got {len(untyped_payload)}, expected at least 10 bytes')
-        phase = int(untyped_payload[0])
-        door = (phase >> 4) in {1, 3}
-        phase = phase % 0x10
-        temperature = int.from_bytes(untyped_payload[1:3], byteorder='big')
-        shutter = int(untyped_payload[3])
-        movement = False
-        if shutter > 100:
-            shutter -= 150
-            movement = True
-
-        burn_time_h = int(untyped_payload[4])
-        burn_time_m = int(untyped_payload[5])
-        burn_time_mins_total = burn_time_h * 60 + burn_time_m
-        alarm1 = int(untyped_payload[6])
-        hood = int(untyped_payload[7])
-        alarm2 = int(untyped_payload[8])
-        position = int(untyped_payload[9])
 
-        return FireplaceState(
-            phase=phase,
-            door=door,
-            temperature=temperature,
-            shutter=shutter,
-            movement=movement,
-            burn_time_mins=burn_time_mins_total,
-            hood=hood,
-            position=position,
-            alarm1=alarm1,
-            alarm2=alarm2,
-        )
+def _controller_datetime(year: int, month: int, source: int, day: int, hour: int, minute: int) -> datetime:
+    # Controllers only report the sources 0 to 2, so higher ones are corrupt readings
+    if source > 2:
+        raise ValueError(f'invalid date and time source {source}')
+    return datetime(year, month, day, hour, minute)
 
 
-@dataclass
+@REGISTRY.message(
+    Field('year', 0, add=2000),
+    # The high nibble of the month tells the source of the date and time
+    Field('month', 1, mask=0x0f),
+    Field('source', 1, shift=4),
+    Field('day', 2),
+    Field('hour', 3),
+    Field('minute', 4),
+    Compose('datetime', _controller_datetime, ('year', 'month', 'source', 'day', 'hour', 'minute')),
+    exact_size=True,
+)
+@dataclass(frozen=True)
 class DateTimeInfo:
+    __slots__ = ('datetime', 'source')
+
     datetime: datetime
     source: int
 
     DATA_TYPE: ClassVar[int] = 0x22
-
-    @classmethod
-    def parse(cls, untyped_payload: bytes) -> 'DateTimeInfo':
-        if len(untyped_payload) != 5:
-            raise ValueError(f'payload has unexpected length {len(untyped_payload)}, expected 5 bytes')
-        year = int(untyped_payload[0])
-        month = int(untyped_payload[1])
-        datetime_source = 0
-        if month > 0x20:
-            datetime_source = 2
-            month -= 0x20
-        elif month > 0x10:
-            datetime_source = 1
-            month -= 0x10
-
-        day = int(untyped_payload[2])
-        hour = int(untyped_payload[3])
-        minute = int(untyped_payload[4])
-
-        system_datetime = datetime(year=2000 + year, month=month, day=day, hour=hour, minute=minute)
-
-        return DateTimeInfo(
-            datetime=system_datetime,
-            source=datetime_source,
-        )
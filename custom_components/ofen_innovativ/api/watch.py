@@ -0,0 +1,132 @@
+import asyncio
+from collections import deque
+from dataclasses import fields
+from time import monotonic
+from typing import Any, Awaitable, Callable, Deque, Iterator, NamedTuple, Optional, Set
+
+from .polling import AdaptivePollPolicy
+from .resilience import TRANSIENT_ERRORS
+from .types import FireplaceState
+
+# What to do when a watcher does not keep up: drop the oldest buffered states, or
+# coalesce all buffered states into the latest one.
+OVERFLOW_DROP = 'drop'
+OVERFLOW_COALESCE = 'coalesce'
+
+_FIELD_NAMES = tuple(field.name for field in fields(FireplaceState))
+
+
+class FieldChange(NamedTuple):
+    field: str
+    old: Any
+    new: Any
+
+
+def field_changes(old: Optional[FireplaceState], new: FireplaceState) -> Iterator[FieldChange]:
+    """Return the changes of the individual fields from one state to another, or of all fields if there was none."""
+    for name in _FIELD_NAMES:
+        new_value = getattr(new, name)
+        old_value = None if old is None else getattr(old, name)
+        if old is None or old_value != new_value:
+            yield FieldChange(name, old_value, new_value)
+
+
+class _Subscription:
+    def __init__(self, buffer: int, overflow: str):
+        if overflow not in (OVERFLOW_DROP, OVERFLOW_COALESCE):
+            raise ValueError(f'unknown overflow policy {overflow!r}')
+        if buffer < 1:
+            raise ValueError('buffer must hold at least one state')
+        self._states: Deque[FireplaceState] = deque(maxlen=1 if overflow == OVERFLOW_COALESCE else buffer)
+        self._ready = asyncio.Event()
+        self._error: Optional[BaseException] = None
+        self._ended = False
+        self.dropped = 0
+
+    def put(self, state: FireplaceState):
+        if len(self._states) == self._states.maxlen:
+            self.dropped += 1
+        self._states.append(state)
+        self._ready.set()
+
+    def fail(self, error: BaseException):
+        self._error = error
+        self._ready.set()
+
+    def end(self):
+        self._ended = True
+        self._ready.set()
+
+    async def get(self) -> Optional[FireplaceState]:
+        """Return the next state, or None once the subscription has ended and no states are left."""
+        while not self._states:
+            if self._error is not None:
+                raise self._error
+            if self._ended:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return self._states.popleft()
+
+
+class StateWatcher:
+    """Poll the fireplace state on behalf of any number of subscriptions.
+
+    A single poll loop runs while there are subscriptions, at the intervals decided by
+    the poll policy, and hands every state that differs from the previous one to all
+    subscriptions. Transient errors are skipped over, any other error ends all
+    subscriptions with that error. Stopping the watcher ends all subscriptions, once
+    their buffered states have been taken.
+    """
+
+    def __init__(self, fetch: Callable[[], Awaitable[FireplaceState]], poll_policy: AdaptivePollPolicy):
+        self._fetch = fetch
+        self._poll_policy = poll_policy
+        self._subscriptions: Set[_Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last: Optional[FireplaceState] = None
+
+    def subscribe(self, buffer: int, overflow: str) -> _Subscription:
+        subscription = _Subscription(buffer, overflow)
+        self._subscriptions.add(subscription)
+        if self._last is not None:
+            # Start off with the current state instead of waiting for the next change
+            subscription.put(self._last)
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: _Subscription):
+        self._subscriptions.discard(subscription)
+        if not self._subscriptions:
+            self.stop()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._last = None
+        for subscription in self._subscriptions:
+            subscription.end()
+        self._subscriptions.clear()
+
+    async def _run(self):
+        interval = self._poll_policy.active_interval
+        while self._subscriptions:
+            try:
+                state = await self._fetch()
+            except TRANSIENT_ERRORS:
+                pass
+            except Exception as err:
+                for subscription in self._subscriptions:
+                    subscription.fail(err)
+                self._task = None
+                self._last = None
+                return
+            else:
+                if state != self._last:
+                    self._last = state
+                    for subscription in self._subscriptions:
+                        subscription.put(state)
+                interval = self._poll_policy.update(state, monotonic())
+            await asyncio.sleep(interval)
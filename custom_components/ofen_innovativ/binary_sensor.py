@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -26,12 +26,18 @@ class OfenInnovativBinarySensorRequiredKeysMixin:
 
     value_fn: Optional[Callable[[OfenInnovativPollData], bool]] = None
     icon_fn: Optional[Callable[[OfenInnovativPollData], str]] = None
+    attributes_fn: Optional[Callable[[OfenInnovativPollData], Optional[Dict[str, Any]]]] = None
 
     def dynamic_icon(self, data: OfenInnovativPollData):
         if self.icon_fn is not None:
             return self.icon_fn(data)
         return getattr(self, 'icon', '')
 
+    def dynamic_attributes(self, data: OfenInnovativPollData):
+        if self.attributes_fn is not None:
+            return self.attributes_fn(data)
+        return None
+
 
 @dataclass
 class OfenInnovativBinarySensorEntityDescription(
@@ -84,4 +90,4 @@ class OfenInnovativBinarySensor(OfenInnovativEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         """Use this to get the correct value."""
-        return self.entity_description.value_fn(self.coordinator.data)
+        return self._projected_value
@@ -3,21 +3,48 @@ from __future__ import annotations
 
 from collections.abc import Mapping
 from dataclasses import dataclass
+import ipaddress
 from typing import Any, Dict
+import xml.etree.ElementTree as ET
 
-from aiohttp import ClientConnectionError
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.components import network
 from homeassistant.components.dhcp import DhcpServiceInfo
 from homeassistant.const import CONF_API_KEY, CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
-
-from .const import DOMAIN, LOGGER
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    DOMAIN,
+    LOGGER,
+    CONF_ACTIVE_SCAN_INTERVAL,
+    CONF_BURST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_RECORD_PROTOCOL,
+    CONF_STALE_WINDOW,
+    CONF_SUBNET,
+    CONF_SYNC_CLOCK,
+    DEFAULT_ACTIVE_SCAN_INTERVAL,
+    DEFAULT_BURST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_STALE_WINDOW,
+    DEFAULT_SYNC_CLOCK,
+    REQUEST_TIMEOUT,
+)
 from .api import OfenInnovativAPIClient
+from .api.discovery import DiscoveredController, scan, scan_hosts, serial_from_mac
+from .api.errors import ResponseParseError, ResponseValueError
+from .api.resilience import TRANSIENT_ERRORS
 
 STEP_USER_DATA_SCHEMA = vol.Schema({vol.Required(CONF_HOST): str})
 
+SCAN_INTERVAL_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=1, max=3600))
+STALE_WINDOW_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=0, max=86400))
+
 
 @dataclass
 class DiscoveredHostInfo:
@@ -27,14 +54,17 @@ class DiscoveredHostInfo:
     serial: str | None
 
 
-async def validate_host_input(host: str) -> str:
+async def validate_host_input(hass: HomeAssistant, host: str) -> str:
     """Validate the user input allows us to connect.
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
     LOGGER.debug("Instantiating Ofen-Innovativ with host: [%s]", host)
 
-    async with OfenInnovativAPIClient(fireplace_host=host) as api_client:
+    # Fail fast rather than keep the form waiting through the retries of the integration
+    async with OfenInnovativAPIClient(
+        fireplace_host=host, session=async_get_clientsession(hass), request_timeout=REQUEST_TIMEOUT, retries=0
+    ) as api_client:
         ip_status = await api_client.retrieve_ip_status()
 
     LOGGER.debug("Found a fireplace: %s", ip_status.mac_address)
@@ -50,18 +80,24 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         """Initialize the Config Flow Handler."""
         self._host: str = ""
+        self._serial: str = ""
+        self._discovered: Dict[str, DiscoveredController] = {}
+
+    async def _async_create_fireplace_entry(self, host: str, serial: str) -> FlowResult:
+        """Create the entry of a fireplace, or update the host of the entry with the same serial."""
+        await self.async_set_unique_id(serial)
+        self._abort_if_unique_id_configured(updates={CONF_HOST: host})
+        return self.async_create_entry(
+            title=f'Ofen-Innovativ Fireplace {serial}',
+            data={CONF_HOST: host},
+        )
 
     async def _async_validate_ip_and_continue(self, host: str) -> FlowResult:
         """Validate local config and continue."""
         self._async_abort_entries_match({CONF_HOST: host})
-        self._serial = (await validate_host_input(host)).replace(':', '').upper()
+        self._serial = serial_from_mac(await validate_host_input(self.hass, host))
         self._host = host
-
-        await self.async_set_unique_id(self._serial)
-        return self.async_create_entry(
-            title=f'Ofen-Innovativ Fireplace {self._serial}',
-            data={CONF_HOST: host},
-        )
+        return await self._async_create_fireplace_entry(host, self._serial)
 
     async def async_step_manual_device_entry(self, user_input=None):
         """Handle manual input of local IP configuration."""
@@ -71,7 +107,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             try:
                 return await self._async_validate_ip_and_continue(self._host)
-            except (ConnectionError, ClientConnectionError):
+            except (*TRANSIENT_ERRORS, ResponseParseError, ResponseValueError, ET.ParseError):
                 errors["base"] = "cannot_connect"
 
         return self.async_show_form(
@@ -85,4 +121,121 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Start the user flow."""
 
-        return await self.async_step_manual_device_entry()
+        return self.async_show_menu(step_id="user", menu_options=["scan", "manual_device_entry"])
+
+    async def _async_default_subnet(self) -> str:
+        """Return the /24 subnet of Home Assistant's own address."""
+        try:
+            source_ip = await network.async_get_source_ip(self.hass)
+        except HomeAssistantError:
+            return ""
+        return str(ipaddress.ip_network(f"{source_ip}/24", strict=False))
+
+    async def async_step_scan(self, user_input: Dict[str, Any] | None = None) -> FlowResult:
+        """Scan a subnet for fireplaces that are not configured yet."""
+        LOGGER.debug("STEP: scan")
+        errors = {}
+        if user_input is not None:
+            try:
+                hosts = scan_hosts(user_input[CONF_SUBNET])
+            except ValueError:
+                errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                controllers = await scan(hosts)
+                LOGGER.debug("Found fireplaces: %s", controllers)
+                configured = self._async_current_ids()
+                self._discovered = {
+                    controller.host: controller for controller in controllers if controller.serial not in configured
+                }
+                if self._discovered:
+                    return await self.async_step_pick_device()
+                errors["base"] = "no_devices_found"
+
+        subnet = user_input[CONF_SUBNET] if user_input else await self._async_default_subnet()
+        return self.async_show_form(
+            step_id="scan",
+            errors=errors,
+            data_schema=vol.Schema({vol.Required(CONF_SUBNET, default=subnet): str}),
+        )
+
+    async def async_step_pick_device(self, user_input: Dict[str, Any] | None = None) -> FlowResult:
+        """Pick one of the fireplaces found by the scan."""
+        if user_input is not None:
+            controller = self._discovered[user_input[CONF_HOST]]
+            return await self._async_create_fireplace_entry(controller.host, controller.serial)
+
+        return self.async_show_form(
+            step_id="pick_device",
+            data_schema=vol.Schema({
+                vol.Required(CONF_HOST): vol.In({
+                    host: f"{controller.serial} ({host})" for host, controller in self._discovered.items()
+                }),
+            }),
+        )
+
+    async def async_step_dhcp(self, discovery_info: DhcpServiceInfo) -> FlowResult:
+        """Update the address of a configured fireplace found by DHCP."""
+        await self.async_set_unique_id(serial_from_mac(discovery_info.macaddress))
+        self._abort_if_unique_id_configured(updates={CONF_HOST: discovery_info.ip})
+        # DHCP discovery is only set up for registered devices, which are configured
+        return self.async_abort(reason="not_configured")
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the polling options for Ofen-Innovativ."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the Options Flow Handler."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: Dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the polling, clock synchronization and protocol recording options."""
+        errors = {}
+        if user_input is not None:
+            if (user_input[CONF_BURST_SCAN_INTERVAL]
+                    <= user_input[CONF_ACTIVE_SCAN_INTERVAL]
+                    <= user_input[CONF_IDLE_SCAN_INTERVAL]):
+                return self.async_create_entry(title="", data=user_input)
+            errors["base"] = "invalid_scan_intervals"
+
+        options = user_input or self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            errors=errors,
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_BURST_SCAN_INTERVAL,
+                    default=options.get(CONF_BURST_SCAN_INTERVAL, DEFAULT_BURST_SCAN_INTERVAL),
+                ): SCAN_INTERVAL_VALIDATOR,
+                vol.Required(
+                    CONF_ACTIVE_SCAN_INTERVAL,
+                    default=options.get(CONF_ACTIVE_SCAN_INTERVAL, DEFAULT_ACTIVE_SCAN_INTERVAL),
+                ): SCAN_INTERVAL_VALIDATOR,
+                vol.Required(
+                    CONF_IDLE_SCAN_INTERVAL,
+                    default=options.get(CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL),
+                ): SCAN_INTERVAL_VALIDATOR,
+                vol.Required(
+                    CONF_STALE_WINDOW,
+                    default=options.get(CONF_STALE_WINDOW, DEFAULT_STALE_WINDOW),
+                ): STALE_WINDOW_VALIDATOR,
+                vol.Required(
+                    CONF_SYNC_CLOCK,
+                    default=options.get(CONF_SYNC_CLOCK, DEFAULT_SYNC_CLOCK),
+                ): bool,
+                vol.Required(
+                    CONF_RECORD_PROTOCOL,
+                    default=options.get(CONF_RECORD_PROTOCOL, False),
+                ): bool,
+            }),
+        )
@@ -1,6 +1,7 @@
 """Constants for the Ofen Innovativ integration."""
 from __future__ import annotations
 
+from datetime import timedelta
 import logging
 
 DOMAIN = "ofen_innovativ"
@@ -10,5 +11,83 @@ CONF_HOST = "host"
 LOGGER = logging.getLogger(__package__)
 
 CONF_SERIAL = "serial"
+# Subnet scanned for fireplaces by the config flow, in CIDR notation.
+CONF_SUBNET = "subnet"
 
 DEFAULT_THERMOSTAT_TEMP = 21
+
+# Refresh intervals of the individual pieces of data polled from the controller. The
+# fireplace state is refreshed on every tick, see the scan intervals below. The
+# controller clock is extrapolated locally in between its polls.
+DATETIME_POLL_INTERVAL = timedelta(minutes=30)
+IP_STATUS_POLL_INTERVAL = timedelta(hours=1)
+
+# Bounds of the adaptive fireplace state poll interval, in seconds.
+CONF_BURST_SCAN_INTERVAL = "burst_scan_interval"
+CONF_ACTIVE_SCAN_INTERVAL = "active_scan_interval"
+CONF_IDLE_SCAN_INTERVAL = "idle_scan_interval"
+
+DEFAULT_BURST_SCAN_INTERVAL = 2
+DEFAULT_ACTIVE_SCAN_INTERVAL = 5
+DEFAULT_IDLE_SCAN_INTERVAL = 60
+
+# Deadline of a single request to the controller, in seconds, and how often a failed
+# request is retried, after a randomized delay of up to the backoff doubled per retry.
+REQUEST_TIMEOUT = 5
+REQUEST_RETRIES = 2
+REQUEST_RETRY_BACKOFF = 0.5
+
+# The fireplace state and the controller clock are requested one after the other over
+# the controller's line, so the time budget of a poll, in seconds, covers both of them
+# with all their retries and the longest backoff delays. The retries are thus never cut
+# short by the budget.
+LINE_REQUESTS_PER_POLL = 2
+POLL_BUDGET = LINE_REQUESTS_PER_POLL * (
+    (REQUEST_RETRIES + 1) * REQUEST_TIMEOUT
+    + sum(REQUEST_RETRY_BACKOFF * 2 ** retry for retry in range(REQUEST_RETRIES))
+)
+
+# How long the last good data keeps being served while the controller cannot be reached, in seconds.
+CONF_STALE_WINDOW = "stale_window"
+DEFAULT_STALE_WINDOW = 300
+
+# If enabled, the controller clock is set when it is unset or off by more than the
+# threshold, in seconds, but at most once per interval. Writing to the controller is
+# opt-in.
+CONF_SYNC_CLOCK = "sync_clock"
+DEFAULT_SYNC_CLOCK = False
+CLOCK_SYNC_THRESHOLD = 120
+CLOCK_SYNC_MIN_INTERVAL = timedelta(hours=1)
+
+# Opt-in log of the raw requests and responses, in the configuration directory.
+CONF_RECORD_PROTOCOL = "record_protocol"
+PROTOCOL_LOG_FILENAME = f"{DOMAIN}.{{entry_id}}.protocol"
+
+# Polls of all fireplaces are scheduled by a shared hub.
+DATA_POLL_HUB = f"{DOMAIN}_poll_hub"
+MAX_CONCURRENT_POLLS_PER_HOST = 1
+MAX_CONCURRENT_POLLS_PER_NETWORK = 4
+# Maximum relative deviation of a poll from its interval.
+POLL_JITTER = 0.1
+
+# The OpenMetrics exposition of all fireplaces is rendered after every poll and served from memory.
+DATA_EXPORTER = f"{DOMAIN}_exporter"
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+
+SERVICE_GET_HISTORY = "get_history"
+EVENT_HISTORY = f"{DOMAIN}_history"
+ATTR_TIER = "tier"
+ATTR_SINCE = "since"
+
+# Finished burn sessions are persisted per config entry.
+SESSIONS_STORAGE_VERSION = 1
+SESSIONS_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.sessions"
+SESSIONS_SAVE_DELAY = 10
+
+# The last poll data is persisted per config entry, so that entities can be set up from
+# it right away after a restart, while the first refresh runs in the background.
+STATE_STORAGE_VERSION = 1
+STATE_STORAGE_KEY = f"{DOMAIN}.{{entry_id}}.state"
+STATE_SAVE_INTERVAL = timedelta(minutes=5)
+STATE_SAVE_DELAY = 10
+ATTR_STALE = "stale"
@@ -1,19 +1,43 @@
 """The Ofen-Innovativ integration."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
-from datetime import timedelta
+from datetime import datetime, timedelta
+from time import monotonic, perf_counter
+from typing import Any, Dict, Optional, Set
 
-from aiohttp import ClientConnectionError
 from async_timeout import timeout
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, format_mac
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, LOGGER
+from .const import (
+    DOMAIN,
+    LOGGER,
+    DATETIME_POLL_INTERVAL,
+    IP_STATUS_POLL_INTERVAL,
+    CLOCK_SYNC_MIN_INTERVAL,
+    CLOCK_SYNC_THRESHOLD,
+    POLL_BUDGET,
+    SESSIONS_SAVE_DELAY,
+    STATE_SAVE_DELAY,
+    STATE_SAVE_INTERVAL,
+)
 
 from .api import OfenInnovativAPIClient
+from .analytics import BurnSessionStats, BurnSessionTracker
+from .api.clock import ClockModel
+from .api.errors import ResponseParseError, ResponseValueError
+from .api.metrics import FANOUT
+from .api.polling import AdaptivePollPolicy
+from .api.resilience import TRANSIENT_ERRORS
+from .history import FireplaceHistory
 from .api.types import (
     IPStatus,
     FireplaceState,
@@ -26,36 +50,277 @@ class OfenInnovativPollData:
     ip_status: IPStatus
     fireplace_state: FireplaceState
     system_datetime: DateTimeInfo
+    burn_session: Optional[BurnSessionStats] = None
+    metrics: Optional[Dict[str, Any]] = None
+    controller_time: Optional[datetime] = None
 
     @property
     def serial(self) -> str:
         return self.ip_status.mac_address.replace(':', '').upper()
 
+    def as_stored(self) -> Dict[str, Any]:
+        """Return a compact representation for storage, without the derived data."""
+        state = self.fireplace_state
+        return {
+            "mac_address": self.ip_status.mac_address,
+            "fireplace_state": [state.phase, state.door, state.temperature, state.shutter, state.movement,
+                                state.burn_time_mins, state.hood, state.position, state.alarm1, state.alarm2],
+            "system_datetime": [self.system_datetime.datetime.isoformat(), self.system_datetime.source],
+        }
+
+    @classmethod
+    def from_stored(cls, data: Dict[str, Any]) -> OfenInnovativPollData:
+        """Restore poll data from its compact representation."""
+        system_datetime, source = data["system_datetime"]
+        return cls(
+            ip_status=IPStatus(data["mac_address"]),
+            fireplace_state=FireplaceState(*data["fireplace_state"]),
+            system_datetime=DateTimeInfo(datetime.fromisoformat(system_datetime), source),
+        )
+
+
+@dataclass
+class _PollTier:
+    """A single datum polled at its own interval."""
+
+    fetch: Callable[[], Awaitable[Any]]
+    interval: timedelta
+    next_due: float = 0.0
+
 
 class OfenInnovativDataUpdateCoordinator(DataUpdateCoordinator[OfenInnovativPollData]):
-    """Class to manage the polling of the fireplace API."""
+    """Class to manage the polling of the fireplace API.
+
+    Each datum of OfenInnovativPollData is refreshed according to its own interval, and
+    all fetches that are due in the same tick run concurrently. The fireplace state is
+    refreshed on every tick, and the tick rate adapts to the fireplace state as decided
+    by the poll policy; if one of the slower data fails, its previous value is kept and it
+    is fetched again in the next tick. The coordinator has no timer of its own; the ticks
+    are started by the poll hub according to poll_interval. Every fireplace state is also
+    recorded in the history and fed to the burn session tracker, whose finished sessions
+    are persisted.
+
+    Entities register a projection of the poll data under their listener context. After
+    each update, all projections are evaluated once into a snapshot, and only those
+    listeners whose projected value differs from the previous snapshot are notified.
+
+    The poll data is persisted now and then, and can be restored as the initial data after
+    a restart. Restored data is stale until the first successful update, and is served
+    for up to the stale window while the fireplace cannot be reached.
+
+    Each poll must complete within the poll budget. If a poll fails with a transient
+    error, the last good data is served as stale data for up to stale_window seconds,
+    after which the update fails. While the client's circuit breaker is open, the
+    fireplace state alone is requested first to probe whether the controller is back.
+
+    The controller clock is only polled occasionally, to feed a clock model that
+    extrapolates it in between. If sync_clock is set, the controller clock is set to the
+    local time whenever the model finds it off by more than the threshold, or unset
+    before it has been set once.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         api_client: OfenInnovativAPIClient,
+        poll_policy: AdaptivePollPolicy,
+        session_store: Store,
+        state_store: Store,
+        stale_window: float,
+        sync_clock: bool,
     ) -> None:
         """Initialize the Coordinator."""
         super().__init__(
             hass,
             LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=15),
+            update_interval=None,
         )
         self._api_client = api_client
+        self._poll_policy = poll_policy
+        self.poll_interval = timedelta(seconds=poll_policy.active_interval)
+        self.history = FireplaceHistory()
+        self.sessions = BurnSessionTracker()
+        self._session_store = session_store
+        self._state_store = state_store
+        self._state_save_due = 0.0
+        self._stale_window = stale_window
+        self._last_success: Optional[float] = None
+        self.stale = False
+        self.clock = ClockModel(dt_util.DEFAULT_TIME_ZONE)
+        self._sync_clock = sync_clock
+        self._clock_sync_due = 0.0
+        self._clock_set = False
+        self._tiers: Dict[str, _PollTier] = {
+            "ip_status": _PollTier(api_client.retrieve_ip_status, IP_STATUS_POLL_INTERVAL),
+            "fireplace_state": _PollTier(api_client.retrieve_fireplace_state, timedelta(0)),
+            "system_datetime": _PollTier(api_client.retrieve_system_datetime, DATETIME_POLL_INTERVAL),
+        }
+        self._values: Dict[str, Any] = {}
+        self._projections: Dict[str, Callable[[OfenInnovativPollData], Any]] = {}
+        self._snapshot: Dict[str, Any] = {}
+        self._notified_success: bool | None = None
+        self._notified_stale = False
 
     async def _async_update_data(self) -> OfenInnovativPollData:
+        now = monotonic()
+        try:
+            async with timeout(POLL_BUDGET):
+                fetched = await self._async_fetch_due(now)
+        except TRANSIENT_ERRORS as err:
+            if self.data is None or self._last_success is None or now - self._last_success > self._stale_window:
+                raise UpdateFailed(f"Error communicating with {self._api_client.host}: {err!r}") from err
+            LOGGER.debug("Serving stale data of %s: %r", self._api_client.host, err)
+            self.stale = True
+            return self.data
+        self._last_success = now
+
+        state = self._values["fireplace_state"]
+        timestamp = dt_util.utcnow().timestamp()
+        if "system_datetime" in fetched:
+            self.clock.add_sample(timestamp, self._values["system_datetime"])
+        if (
+            self._sync_clock
+            and now >= self._clock_sync_due
+            and self.clock.needs_sync(timestamp, CLOCK_SYNC_THRESHOLD, include_unset=not self._clock_set)
+        ):
+            await self._async_sync_clock(now)
+        self.history.append(timestamp, state)
+        if self.sessions.add(timestamp, state) is not None:
+            self._session_store.async_delay_save(self._sessions_to_store, SESSIONS_SAVE_DELAY)
+
+        self.poll_interval = timedelta(seconds=self._poll_policy.update(state, now))
+        if now >= self._state_save_due:
+            self._state_store.async_delay_save(self._state_to_store, STATE_SAVE_DELAY)
+            self._state_save_due = now + STATE_SAVE_INTERVAL.total_seconds()
+        self.stale = False
         return OfenInnovativPollData(
-            ip_status=await self._api_client.retrieve_ip_status(),
-            fireplace_state=await self._api_client.retrieve_fireplace_state(),
-            system_datetime=await self._api_client.retrieve_system_datetime(),
+            **self._values,
+            burn_session=self.sessions.latest,
+            metrics=self._api_client.metrics.as_dict(),
+            controller_time=self.clock.controller_datetime(timestamp),
         )
 
+    async def _async_sync_clock(self, now: float) -> None:
+        self._clock_sync_due = now + CLOCK_SYNC_MIN_INTERVAL.total_seconds()
+        offset = self.clock.offset_at(dt_util.utcnow().timestamp())
+        LOGGER.info(
+            "Setting the clock of %s, which is %s",
+            self._api_client.host, "unset" if self.clock.source == 0 else f"off by {offset:.0f} s",
+        )
+        try:
+            await self._api_client.set_system_datetime(dt_util.now().replace(tzinfo=None))
+        except (*TRANSIENT_ERRORS, ResponseParseError, ResponseValueError, ValueError) as err:
+            # The state has been fetched regardless, so the poll does not fail
+            LOGGER.warning("Error setting the clock of %s: %r", self._api_client.host, err)
+            return
+        # Start over with a fresh reading in the next poll. Once set, the clock is only set
+        # again when it has drifted, as it may still be reported as unset
+        self._clock_set = True
+        self.clock.reset()
+        self._tiers["system_datetime"].next_due = now
+
+    async def _async_fetch_due(self, now: float) -> Set[str]:
+        due = {
+            name: tier for name, tier in self._tiers.items()
+            if name not in self._values or tier.next_due <= now
+        }
+        if not self._api_client.circuit_closed and len(due) > 1:
+            # Probe with a single request, and only poll the rest once it has succeeded
+            tier = due.pop("fireplace_state")
+            self._values["fireplace_state"] = await tier.fetch()
+            tier.next_due = now
+        results = await asyncio.gather(*(tier.fetch() for tier in due.values()), return_exceptions=True)
+        fetched = {"fireplace_state"}
+        for (name, tier), value in zip(due.items(), results):
+            if isinstance(value, BaseException):
+                # Only the fireplace state, or a datum that was never fetched, fails the tick;
+                # otherwise the previous value is kept and fetched again in the next tick
+                if name == "fireplace_state" or name not in self._values:
+                    raise value
+                LOGGER.debug("Keeping the previous %s of %s: %r", name, self._api_client.host, value)
+                continue
+            self._values[name] = value
+            tier.next_due = now + tier.interval.total_seconds()
+            fetched.add(name)
+        # The fireplace state is fetched every time, possibly as the probe
+        return fetched
+
+    async def async_restore_state(self, serial: str | None) -> bool:
+        """Restore the persisted poll data as stale initial data, and return whether there was any.
+
+        Data persisted for a fireplace with another serial than the given one is discarded.
+        The stale window starts with the restore, as if the data had just been polled.
+        """
+        if (stored := await self._state_store.async_load()) is None:
+            return False
+        try:
+            data = OfenInnovativPollData.from_stored(stored["poll_data"])
+        except (KeyError, TypeError, ValueError) as err:
+            LOGGER.warning("Discarding invalid persisted state of %s: %s", self._api_client.host, err)
+            return False
+        if stored.get("serial") != serial:
+            LOGGER.warning(
+                "Discarding persisted state of %s, which belongs to fireplace %s", self._api_client.host,
+                stored.get("serial"),
+            )
+            return False
+        data.burn_session = self.sessions.latest
+        self.data = data
+        self.stale = True
+        self._last_success = monotonic()
+        return True
+
+    @callback
+    def _state_to_store(self) -> Dict[str, Any]:
+        return {"serial": self.data.serial, "poll_data": self.data.as_stored()}
+
+    async def async_load_sessions(self) -> None:
+        """Load the finished burn sessions from storage."""
+        if (stored := await self._session_store.async_load()) is not None:
+            self.sessions = BurnSessionTracker(BurnSessionStats.from_list(data) for data in stored["sessions"])
+
+    @callback
+    def _sessions_to_store(self) -> Dict[str, Any]:
+        return {"sessions": self.sessions.finished_as_lists()}
+
+    @callback
+    def async_add_projection(self, key: str, projection: Callable[[OfenInnovativPollData], Any]) -> None:
+        """Register a projection of the poll data for the listener with the given context."""
+        self._projections[key] = projection
+        if self.data is not None:
+            self._snapshot[key] = projection(self.data)
+
+    def projected_value(self, key: str) -> Any:
+        """Return the value of the given projection as of the last update."""
+        return self._snapshot[key]
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose projected value has changed."""
+        start = perf_counter()
+        if self.data is not None:
+            snapshot = {key: projection(self.data) for key, projection in self._projections.items()}
+        else:
+            snapshot = self._snapshot
+        changed = {key for key, value in snapshot.items() if key not in self._snapshot or self._snapshot[key] != value}
+        self._snapshot = snapshot
+
+        # A change of availability or staleness concerns every entity
+        notify_all = self.last_update_success != self._notified_success or self.stale != self._notified_stale
+        self._notified_success = self.last_update_success
+        self._notified_stale = self.stale
+
+        for update_callback, context in list(self._listeners.values()):
+            if notify_all or context not in snapshot or context in changed:
+                update_callback()
+        self._api_client.metrics.observe(FANOUT, perf_counter() - start)
+
+    @property
+    def api_client(self) -> OfenInnovativAPIClient:
+        """Return the API client used for polling."""
+        return self._api_client
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device info."""
@@ -64,5 +329,7 @@ class OfenInnovativDataUpdateCoordinator(DataUpdateCoordinator[OfenInnovativPoll
             model="OI-",
             name="Ofen-Innovativ Fireplace",
             identifiers={("IntelliFire", f"{self.data.serial}]")},
+            # The MAC address lets DHCP discovery recognize the fireplace on a new address
+            connections={(CONNECTION_NETWORK_MAC, format_mac(self.data.ip_status.mac_address))},
             configuration_url=f"http://{self._api_client.host}/",
         )
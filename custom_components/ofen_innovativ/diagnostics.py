@@ -0,0 +1,26 @@
+"""Diagnostics support for Ofen-Innovativ."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import OfenInnovativDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: OfenInnovativDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "poll_data": asdict(coordinator.data) if coordinator.data is not None else None,
+        "history": {name: tier.as_dict() for name, tier in coordinator.history.tiers.items()},
+        "burn_sessions": [asdict(stats) for stats in coordinator.sessions.finished],
+        "metrics": coordinator.api_client.metrics.as_dict(),
+    }
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from typing import Any, Dict, Optional
+
 from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import ATTR_STALE, DOMAIN
 from .coordinator import OfenInnovativDataUpdateCoordinator
 
 
@@ -18,10 +20,35 @@ class OfenInnovativEntity(CoordinatorEntity[OfenInnovativDataUpdateCoordinator])
         description: EntityDescription,
     ) -> None:
         """Class initializer."""
-        super().__init__(coordinator=coordinator)
+        super().__init__(coordinator=coordinator, context=description.key)
         self.entity_description = description
+        # Let the coordinator evaluate the value, icon and attributes once per update, and notify us only when
+        # they change
+        coordinator.async_add_projection(
+            description.key,
+            lambda data: (description.value_fn(data), description.dynamic_icon(data),
+                          description.dynamic_attributes(data)),
+        )
         # Set the Display name the User will see
         self._attr_name = f"Fireplace {description.name}"
         self._attr_unique_id = f"{DOMAIN}-{coordinator.data.serial}-{description.key}"
         # Configure the Device Info
         self._attr_device_info = self.coordinator.device_info
+
+    @property
+    def _projected_value(self) -> Any:
+        """Return the value of this entity as of the last update."""
+        return self.coordinator.projected_value(self.entity_description.key)[0]
+
+    @property
+    def _projected_icon(self) -> str:
+        """Return the icon of this entity as of the last update."""
+        return self.coordinator.projected_value(self.entity_description.key)[1]
+
+    @property
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        """Return the state attributes of this entity as of the last update."""
+        attributes = self.coordinator.projected_value(self.entity_description.key)[2]
+        if self.coordinator.stale:
+            return {**(attributes or {}), ATTR_STALE: True}
+        return attributes
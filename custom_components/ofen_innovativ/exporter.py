@@ -0,0 +1,181 @@
+"""OpenMetrics exporter of the state and the client metrics of all fireplaces."""
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import Any, Dict, List, Tuple
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_EXPORTER, METRICS_URL
+from .coordinator import OfenInnovativDataUpdateCoordinator
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Metric families in the order of exposition: name, type, unit and help text
+_FAMILIES: List[Tuple[str, str, str, str]] = [
+    ("ofen_innovativ_up", "gauge", "", "Whether the last poll of the fireplace succeeded."),
+    ("ofen_innovativ_stale", "gauge", "", "Whether the exported state is stale."),
+    ("ofen_innovativ_last_success_timestamp_seconds", "gauge", "seconds", "Time of the last successful poll."),
+    ("ofen_innovativ_temperature_celsius", "gauge", "celsius", "Temperature of the fireplace."),
+    ("ofen_innovativ_phase", "gauge", "", "Burn phase of the fireplace, 0 when the fire is out."),
+    ("ofen_innovativ_door_open", "gauge", "", "Whether the door is open."),
+    ("ofen_innovativ_shutter_percent", "gauge", "percent", "Opening of the air shutter."),
+    ("ofen_innovativ_shutter_moving", "gauge", "", "Whether the air shutter is moving."),
+    ("ofen_innovativ_burn_time_minutes", "gauge", "minutes", "Duration of the current burn."),
+    ("ofen_innovativ_hood", "gauge", "", "State of the hood switch."),
+    ("ofen_innovativ_position_percent", "gauge", "percent", "Position reported by the controller."),
+    ("ofen_innovativ_alarm", "gauge", "", "Alarm codes reported by the controller."),
+    ("ofen_innovativ_client_events", "counter", "", "Requests, retries and errors of the API client."),
+    ("ofen_innovativ_command_queue_depth", "gauge", "", "Commands waiting to be sent on the controller line."),
+    ("ofen_innovativ_stage_duration_seconds", "histogram", "seconds", "Duration of the stages of a poll."),
+]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _value(value: float | bool) -> str:
+    return str(int(value)) if isinstance(value, bool) else repr(value)
+
+
+class OpenMetricsExporter:
+    """Renders the OpenMetrics exposition of all fireplaces.
+
+    The samples of a fireplace are rendered whenever its coordinator has updated, and the
+    exposition is assembled from the samples of all fireplaces right away, so that serving
+    a scrape costs nothing beyond sending the cached text.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an exporter without fireplaces."""
+        self._samples: Dict[str, Dict[str, List[str]]] = {}
+        self._last_success: Dict[str, float] = {}
+        self._remove_listeners: Dict[str, CALLBACK_TYPE] = {}
+        self.text = self._assemble()
+
+    @callback
+    def async_add_coordinator(self, key: str, coordinator: OfenInnovativDataUpdateCoordinator) -> CALLBACK_TYPE:
+        """Export a fireplace under the given key and return a callback to stop exporting it."""
+
+        @callback
+        def update() -> None:
+            self._samples[key] = self._render(key, coordinator)
+            self.text = self._assemble()
+
+        self._remove_listeners[key] = coordinator.async_add_listener(update)
+        if coordinator.data is not None:
+            update()
+
+        @callback
+        def remove() -> None:
+            self.async_remove_coordinator(key)
+
+        return remove
+
+    @callback
+    def async_remove_coordinator(self, key: str) -> None:
+        """Stop exporting the fireplace under the given key, if it is exported."""
+        if (remove_listener := self._remove_listeners.pop(key, None)) is None:
+            return
+        remove_listener()
+        self._samples.pop(key, None)
+        self._last_success.pop(key, None)
+        self.text = self._assemble()
+
+    def _render(self, key: str, coordinator: OfenInnovativDataUpdateCoordinator) -> Dict[str, List[str]]:
+        data = coordinator.data
+        fireplace = {"serial": data.serial, "host": coordinator.api_client.host}
+        labels = _labels(**fireplace)
+        if coordinator.last_update_success and not coordinator.stale:
+            self._last_success[key] = dt_util.utcnow().timestamp()
+        samples: Dict[str, List[str]] = {
+            "ofen_innovativ_up": [f"ofen_innovativ_up{labels} {int(coordinator.last_update_success)}"],
+            "ofen_innovativ_stale": [f"ofen_innovativ_stale{labels} {int(coordinator.stale)}"],
+        }
+        if key in self._last_success:
+            samples["ofen_innovativ_last_success_timestamp_seconds"] = [
+                f"ofen_innovativ_last_success_timestamp_seconds{labels} {_value(self._last_success[key])}"
+            ]
+
+        state = data.fireplace_state
+        for name, value in (
+            ("ofen_innovativ_temperature_celsius", state.temperature),
+            ("ofen_innovativ_phase", state.phase),
+            ("ofen_innovativ_door_open", state.door),
+            ("ofen_innovativ_shutter_percent", state.shutter),
+            ("ofen_innovativ_shutter_moving", state.movement),
+            ("ofen_innovativ_burn_time_minutes", state.burn_time_mins),
+            ("ofen_innovativ_hood", state.hood),
+            ("ofen_innovativ_position_percent", state.position),
+        ):
+            samples[name] = [f"{name}{labels} {_value(value)}"]
+        samples["ofen_innovativ_alarm"] = [
+            f"ofen_innovativ_alarm{_labels(**fireplace, alarm=i)} {value}"
+            for i, value in ((1, state.alarm1), (2, state.alarm2))
+        ]
+
+        metrics = coordinator.api_client.metrics
+        samples["ofen_innovativ_client_events"] = [
+            f"ofen_innovativ_client_events_total{_labels(**fireplace, event=event)} {count}"
+            for event, count in metrics.counters.items()
+        ]
+        samples["ofen_innovativ_command_queue_depth"] = [
+            f"ofen_innovativ_command_queue_depth{labels} {coordinator.api_client.queue_depth}"
+        ]
+        lines = samples["ofen_innovativ_stage_duration_seconds"] = []
+        for stage, histogram in metrics.histograms.items():
+            histogram_dict = histogram.as_dict()
+            cumulative = 0
+            for bound, count in zip([*histogram_dict["bounds"], "+Inf"], histogram_dict["buckets"]):
+                cumulative += count
+                bucket_labels = _labels(**fireplace, stage=stage, le=bound if bound == "+Inf" else repr(bound))
+                lines.append(f"ofen_innovativ_stage_duration_seconds_bucket{bucket_labels} {cumulative}")
+            stage_labels = _labels(**fireplace, stage=stage)
+            lines.append(f"ofen_innovativ_stage_duration_seconds_count{stage_labels} {histogram_dict['count']}")
+            lines.append(f"ofen_innovativ_stage_duration_seconds_sum{stage_labels} {_value(histogram_dict['sum'])}")
+        return samples
+
+    def _assemble(self) -> bytes:
+        lines = []
+        for name, metric_type, unit, help_text in _FAMILIES:
+            lines.append(f"# TYPE {name} {metric_type}")
+            if unit:
+                lines.append(f"# UNIT {name} {unit}")
+            lines.append(f"# HELP {name} {help_text}")
+            for samples in self._samples.values():
+                lines.extend(samples.get(name, ()))
+        lines.append("# EOF\n")
+        return "\n".join(lines).encode()
+
+
+class OpenMetricsView(HomeAssistantView):
+    """Serve the OpenMetrics exposition of all fireplaces."""
+
+    url = METRICS_URL
+    name = "api:ofen_innovativ:metrics"
+
+    def __init__(self, exporter: OpenMetricsExporter) -> None:
+        """Initialize the view."""
+        self._exporter = exporter
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the cached exposition."""
+        return web.Response(body=self._exporter.text, status=HTTPStatus.OK, headers={"Content-Type": CONTENT_TYPE})
+
+
+@callback
+def async_get_exporter(hass: HomeAssistant) -> OpenMetricsExporter:
+    """Return the exporter of a Home Assistant instance, creating it and registering its view if needed."""
+    if (exporter := hass.data.get(DATA_EXPORTER)) is None:
+        exporter = hass.data[DATA_EXPORTER] = OpenMetricsExporter()
+        hass.http.register_view(OpenMetricsView(exporter))
+    return exporter
@@ -0,0 +1,128 @@
+"""In-memory history of the fireplace state."""
+from __future__ import annotations
+
+from array import array
+from typing import Dict, List, Optional
+
+from .api.types import FireplaceState
+
+TIER_RAW = "raw"
+TIER_1MIN = "1min"
+TIER_15MIN = "15min"
+
+
+class HistoryTier:
+    """Ring buffer of fireplace state samples, stored column-wise in fixed-size arrays."""
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty ring buffer."""
+        self.capacity = capacity
+        self._columns = {
+            "timestamp": array("d", bytes(8 * capacity)),
+            "temperature": array("H", bytes(2 * capacity)),
+            "phase": array("B", bytes(capacity)),
+            "shutter": array("h", bytes(2 * capacity)),
+            "position": array("B", bytes(capacity)),
+            "burn_time_mins": array("H", bytes(2 * capacity)),
+        }
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, temperature: int, phase: int, shutter: int, position: int,
+               burn_time_mins: int) -> None:
+        """Append a sample, overwriting the oldest one if the buffer is full."""
+        i = self._next
+        columns = self._columns
+        columns["timestamp"][i] = timestamp
+        columns["temperature"][i] = temperature
+        columns["phase"][i] = phase
+        columns["shutter"][i] = shutter
+        columns["position"][i] = position
+        columns["burn_time_mins"][i] = burn_time_mins
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def as_dict(self, since: Optional[float] = None) -> Dict[str, List[float]]:
+        """Return the samples in chronological order, optionally only those taken at or after since."""
+        start = (self._next - self._size) % self.capacity
+        order = [(start + i) % self.capacity for i in range(self._size)]
+        if since is not None:
+            timestamps = self._columns["timestamp"]
+            order = [i for i in order if timestamps[i] >= since]
+        return {name: [column[i] for i in order] for name, column in self._columns.items()}
+
+
+class _Downsampler:
+    """Aggregates samples into buckets of a fixed duration and appends them to a tier."""
+
+    def __init__(self, tier: HistoryTier, bucket_seconds: float) -> None:
+        self.tier = tier
+        self._bucket_seconds = bucket_seconds
+        self._bucket: Optional[int] = None
+        self._count = 0
+        self._temperature = self._shutter = self._position = 0
+        self._last: Optional[FireplaceState] = None
+
+    def add(self, timestamp: float, state: FireplaceState) -> None:
+        bucket = int(timestamp // self._bucket_seconds)
+        if bucket != self._bucket:
+            self.flush()
+            self._bucket = bucket
+        self._count += 1
+        self._temperature += state.temperature
+        self._shutter += state.shutter
+        self._position += state.position
+        self._last = state
+
+    def flush(self) -> None:
+        if self._count == 0:
+            return
+        count = self._count
+        # Levels are averaged over the bucket, the phase and the burn time are taken from its end
+        self.tier.append(
+            self._bucket * self._bucket_seconds,
+            round(self._temperature / count),
+            self._last.phase,
+            round(self._shutter / count),
+            round(self._position / count),
+            self._last.burn_time_mins,
+        )
+        self._count = 0
+        self._temperature = self._shutter = self._position = 0
+
+
+class FireplaceHistory:
+    """Fixed-memory history of the fireplace state of one fireplace.
+
+    Every sample is kept in the raw tier, and is additionally downsampled into 1 minute
+    and 15 minute averages, which appear in their tiers once the bucket is complete. Each
+    tier is a ring buffer of fixed capacity, so the oldest samples of a tier are dropped
+    once it is full.
+    """
+
+    def __init__(self, raw_capacity: int = 720, minute_capacity: int = 1440, quarter_capacity: int = 672) -> None:
+        """Initialize an empty history."""
+        self._raw = HistoryTier(raw_capacity)
+        self._downsamplers = (
+            _Downsampler(HistoryTier(minute_capacity), 60),
+            _Downsampler(HistoryTier(quarter_capacity), 15 * 60),
+        )
+        self.tiers: Dict[str, HistoryTier] = {
+            TIER_RAW: self._raw,
+            TIER_1MIN: self._downsamplers[0].tier,
+            TIER_15MIN: self._downsamplers[1].tier,
+        }
+
+    def append(self, timestamp: float, state: FireplaceState) -> None:
+        """Record the fireplace state at the given UNIX timestamp."""
+        self._raw.append(timestamp, state.temperature, state.phase, state.shutter, state.position,
+                         state.burn_time_mins)
+        for downsampler in self._downsamplers:
+            downsampler.add(timestamp, state)
+
+    def as_dict(self, tier: str = TIER_RAW, since: Optional[float] = None) -> Dict[str, List[float]]:
+        """Return the columns of a tier, optionally only with the samples taken at or after since."""
+        return self.tiers[tier].as_dict(since)
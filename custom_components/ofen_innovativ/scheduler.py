@@ -0,0 +1,160 @@
+"""Shared poll scheduler for all Ofen-Innovativ fireplaces."""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+import ipaddress
+import random
+from typing import Dict, Optional, Set
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+
+from .const import (
+    LOGGER,
+    DATA_POLL_HUB,
+    MAX_CONCURRENT_POLLS_PER_HOST,
+    MAX_CONCURRENT_POLLS_PER_NETWORK,
+    POLL_JITTER,
+)
+from .coordinator import OfenInnovativDataUpdateCoordinator
+
+# Fractional part of the golden ratio; successive multiples of it are spread evenly
+# over the unit interval, however many fireplaces are registered.
+_GOLDEN_RATIO_FRACTION = 0.6180339887498949
+
+
+def _network_of(host: str) -> str:
+    """Return the key of the network a host belongs to, its /24 for IPv4 addresses."""
+    address = host.rsplit(':', 1)[0] if host.count(':') == 1 else host
+    try:
+        return str(ipaddress.ip_interface(f'{address}/24').network)
+    except ValueError:
+        # Host names may resolve to anything, so treat them as sharing one network
+        return ''
+
+
+@dataclass
+class _ScheduledCoordinator:
+    coordinator: OfenInnovativDataUpdateCoordinator
+    host: str
+    network: str
+    next_due: float
+    task: Optional[asyncio.Task] = None
+
+
+class OfenInnovativPollHub:
+    """Schedule the polls of all fireplaces of a Home Assistant instance.
+
+    Registered coordinators do not poll on their own timers. Instead, the hub starts
+    each poll once the coordinator's poll interval has elapsed, randomly stretched or
+    shortened by up to the poll jitter, and staggers the first polls of the coordinators
+    evenly over their intervals, so that the polls of several fireplaces do not align.
+    The number of polls in flight is bounded per host and per network.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self._hass = hass
+        self._scheduled: Dict[OfenInnovativDataUpdateCoordinator, _ScheduledCoordinator] = {}
+        self._network_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(MAX_CONCURRENT_POLLS_PER_NETWORK))
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(MAX_CONCURRENT_POLLS_PER_HOST))
+        self._registrations = 0
+        self._wakeup = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._polls: Set[asyncio.Task] = set()
+
+    @callback
+    def async_register(self, coordinator: OfenInnovativDataUpdateCoordinator, poll_now: bool = False) -> CALLBACK_TYPE:
+        """Start scheduling the polls of a coordinator and return a callback to stop it.
+
+        Unless poll_now is set, the coordinator is assumed to have just been refreshed,
+        and its first poll is staggered.
+        """
+        host = coordinator.api_client.host
+        self._registrations += 1
+        offset = 0.0 if poll_now else (self._registrations * _GOLDEN_RATIO_FRACTION) % 1.0
+        self._scheduled[coordinator] = _ScheduledCoordinator(
+            coordinator=coordinator,
+            host=host,
+            network=_network_of(host),
+            next_due=self._hass.loop.time() + offset * coordinator.poll_interval.total_seconds(),
+        )
+        if self._runner is None:
+            self._runner = self._hass.loop.create_task(self._run())
+        self._wakeup.set()
+
+        @callback
+        def unregister() -> None:
+            self._async_remove(coordinator)
+
+        return unregister
+
+    async def async_unregister(self, coordinator: OfenInnovativDataUpdateCoordinator) -> None:
+        """Stop scheduling the polls of a coordinator, and wait until its poll in flight is cancelled."""
+        if (task := self._async_remove(coordinator)) is not None:
+            await asyncio.wait([task])
+
+    @callback
+    def _async_remove(self, coordinator: OfenInnovativDataUpdateCoordinator) -> Optional[asyncio.Task]:
+        scheduled = self._scheduled.pop(coordinator, None)
+        task = None if scheduled is None else scheduled.task
+        if task is not None:
+            task.cancel()
+        if not self._scheduled:
+            self.async_stop()
+        return task
+
+    @callback
+    def async_stop(self, event: Event | None = None) -> None:
+        """Stop all polling."""
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+        for task in self._polls:
+            task.cancel()
+
+    async def _run(self) -> None:
+        loop = self._hass.loop
+        while self._scheduled:
+            self._wakeup.clear()
+            now = loop.time()
+            next_due = None
+            for scheduled in self._scheduled.values():
+                if scheduled.task is not None:
+                    continue
+                if scheduled.next_due <= now:
+                    scheduled.task = loop.create_task(self._poll(scheduled))
+                    self._polls.add(scheduled.task)
+                    scheduled.task.add_done_callback(self._polls.discard)
+                elif next_due is None or scheduled.next_due < next_due:
+                    next_due = scheduled.next_due
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), None if next_due is None else next_due - now)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, scheduled: _ScheduledCoordinator) -> None:
+        try:
+            async with self._network_semaphores[scheduled.network], self._host_semaphores[scheduled.host]:
+                await scheduled.coordinator.async_refresh()
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Unexpected error polling %s", scheduled.host)
+        finally:
+            interval = scheduled.coordinator.poll_interval.total_seconds()
+            scheduled.next_due = self._hass.loop.time() + interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+            scheduled.task = None
+            self._wakeup.set()
+
+
+@callback
+def async_get_poll_hub(hass: HomeAssistant) -> OfenInnovativPollHub:
+    """Return the poll hub of a Home Assistant instance, creating it if needed."""
+    if (hub := hass.data.get(DATA_POLL_HUB)) is None:
+        hub = hass.data[DATA_POLL_HUB] = OfenInnovativPollHub(hass)
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, hub.async_stop)
+    return hub
@@ -5,7 +5,7 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -14,11 +14,14 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, TEMP_CELSIUS, TIME_MINUTES
+from homeassistant.const import PERCENTAGE, TEMP_CELSIUS, TIME_MILLISECONDS, TIME_MINUTES
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
+from .analytics import BurnSessionStats
+from .api import metrics
 from .coordinator import OfenInnovativDataUpdateCoordinator, OfenInnovativPollData
 from .entity import OfenInnovativEntity
 
@@ -29,12 +32,65 @@ class OfenInnovativSensorRequiredKeysMixin:
 
     value_fn: Optional[Callable[[OfenInnovativPollData], int | str | datetime | None]] = None
     icon_fn: Optional[Callable[[OfenInnovativPollData], str]] = None
+    attributes_fn: Optional[Callable[[OfenInnovativPollData], Optional[Dict[str, Any]]]] = None
 
     def dynamic_icon(self, data: OfenInnovativPollData):
         if self.icon_fn is not None:
             return self.icon_fn(data)
         return getattr(self, 'icon', '')
 
+    def dynamic_attributes(self, data: OfenInnovativPollData):
+        if self.attributes_fn is not None:
+            return self.attributes_fn(data)
+        return None
+
+
+def _session_value(fn: Callable[[BurnSessionStats], Any]) -> Callable[[OfenInnovativPollData], Any]:
+    """Return a value function evaluating fn on the ongoing or last burn session, if any."""
+    return lambda data: None if data.burn_session is None else fn(data.burn_session)
+
+
+def _session_attributes(data: OfenInnovativPollData) -> Optional[Dict[str, Any]]:
+    if (session := data.burn_session) is None:
+        return None
+    attributes: Dict[str, Any] = {
+        "start": datetime.fromtimestamp(session.start).astimezone(None).isoformat(),
+        "end": None if session.end is None else datetime.fromtimestamp(session.end).astimezone(None).isoformat(),
+    }
+    for phase, seconds in session.phase_seconds:
+        attributes[f"phase_{phase}_minutes"] = round(seconds / 60, 1)
+    return attributes
+
+
+def _counter_value(name: str) -> Callable[[OfenInnovativPollData], int | None]:
+    """Return a value function reading a counter of the client metrics."""
+    return lambda data: None if data.metrics is None else data.metrics["counters"][name]
+
+
+def _gauge_value(name: str) -> Callable[[OfenInnovativPollData], int | None]:
+    """Return a value function reading a gauge of the client metrics."""
+    return lambda data: None if data.metrics is None else data.metrics["gauges"][name]
+
+
+def _histogram_value(name: str) -> Callable[[OfenInnovativPollData], float | None]:
+    """Return a value function reading the median of a histogram of the client metrics, in milliseconds."""
+    return lambda data: None if data.metrics is None else data.metrics["histograms"][name]["p50"] * 1000
+
+
+def _histogram_attributes(name: str) -> Callable[[OfenInnovativPollData], Dict[str, Any] | None]:
+    def attributes(data: OfenInnovativPollData) -> Dict[str, Any] | None:
+        if data.metrics is None:
+            return None
+        histogram = data.metrics["histograms"][name]
+        return {
+            "count": histogram["count"],
+            "p90_ms": histogram["p90"] * 1000,
+            "p99_ms": histogram["p99"] * 1000,
+            "mean_ms": round(histogram["sum"] / histogram["count"] * 1000, 3) if histogram["count"] else None,
+        }
+
+    return attributes
+
 
 @dataclass
 class OfenInnovativSensorEntityDescription(
@@ -44,6 +100,32 @@ class OfenInnovativSensorEntityDescription(
     """Describes a sensor entity."""
 
 
+def _counter_sensor(key: str, name: str) -> OfenInnovativSensorEntityDescription:
+    return OfenInnovativSensorEntityDescription(
+        key=key,
+        name=name,
+        icon="mdi:counter",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=_counter_value(key),
+    )
+
+
+def _histogram_sensor(key: str, name: str) -> OfenInnovativSensorEntityDescription:
+    return OfenInnovativSensorEntityDescription(
+        key=key,
+        name=name,
+        icon="mdi:timer-sand",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=TIME_MILLISECONDS,
+        value_fn=_histogram_value(key),
+        attributes_fn=_histogram_attributes(key),
+    )
+
+
 OFEN_INNOVATIV_SENSORS: List[OfenInnovativSensorEntityDescription] = [
     OfenInnovativSensorEntityDescription(
         key="temperature",
@@ -65,7 +147,10 @@ OFEN_INNOVATIV_SENSORS: List[OfenInnovativSensorEntityDescription] = [
         name="System Time",
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.TIMESTAMP,
-        value_fn=lambda data: data.system_datetime.datetime.astimezone(None),
+        value_fn=lambda data: (
+            data.controller_time if data.controller_time is not None
+            else data.system_datetime.datetime.astimezone(None)
+        ),
     ),
     OfenInnovativSensorEntityDescription(
         key="burn_duration",
@@ -89,6 +174,82 @@ OFEN_INNOVATIV_SENSORS: List[OfenInnovativSensorEntityDescription] = [
         value_fn=lambda data: data.fireplace_state.phase,
         icon_fn=lambda data: 'mdi:fireplace-off' if data.fireplace_state.phase == 0 else 'mdi:fireplace'
     ),
+    # The session sensors describe the ongoing burn session, or else the last one
+    OfenInnovativSensorEntityDescription(
+        key="session_duration",
+        name="Session Duration",
+        icon="mdi:timer-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=TIME_MINUTES,
+        value_fn=_session_value(lambda session: round(session.duration_seconds / 60)),
+        attributes_fn=_session_attributes,
+    ),
+    OfenInnovativSensorEntityDescription(
+        key="session_peak_temperature",
+        name="Session Peak Temperature",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=TEMP_CELSIUS,
+        value_fn=_session_value(lambda session: session.peak_temperature),
+    ),
+    OfenInnovativSensorEntityDescription(
+        key="session_mean_temperature",
+        name="Session Mean Temperature",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=TEMP_CELSIUS,
+        value_fn=_session_value(
+            lambda session: None if session.mean_temperature is None else round(session.mean_temperature, 1)
+        ),
+    ),
+    OfenInnovativSensorEntityDescription(
+        key="session_shutter_mean_opening",
+        name="Session Shutter Mean Opening",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=_session_value(
+            lambda session: None if session.shutter_mean_opening is None else round(session.shutter_mean_opening, 1)
+        ),
+    ),
+    OfenInnovativSensorEntityDescription(
+        key="session_door_openings",
+        name="Session Door Openings",
+        icon="mdi:door-open",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_session_value(lambda session: session.door_openings),
+    ),
+    OfenInnovativSensorEntityDescription(
+        key="session_fuel_loads",
+        name="Session Fuel Loads",
+        icon="mdi:pine-tree-fire",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_session_value(lambda session: session.fuel_loads),
+    ),
+    # Diagnostics of the communication with the controller, disabled by default. The
+    # timing sensors report the median as of the last poll, as bucket upper bounds.
+    _counter_sensor(metrics.REQUESTS, "Requests"),
+    _counter_sensor(metrics.RETRIES, "Request Retries"),
+    _counter_sensor(metrics.FAILURES, "Request Failures"),
+    _counter_sensor(metrics.CHECKSUM_FAILURES, "Checksum Failures"),
+    _counter_sensor(metrics.UNEXPECTED_DATA_TYPES, "Unexpected Response Types"),
+    _counter_sensor(metrics.CIRCUIT_REJECTIONS, "Circuit Breaker Rejections"),
+    _counter_sensor(metrics.MERGED_WRITES, "Merged Writes"),
+    OfenInnovativSensorEntityDescription(
+        key=metrics.QUEUE_DEPTH,
+        name="Command Queue Depth",
+        icon="mdi:tray-full",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_gauge_value(metrics.QUEUE_DEPTH),
+    ),
+    _histogram_sensor(metrics.QUEUE_WAIT, "Command Queue Wait Time"),
+    _histogram_sensor(metrics.HTTP_ROUNDTRIP, "HTTP Round Trip Time"),
+    _histogram_sensor(metrics.XML_PARSE, "XML Parse Time"),
+    _histogram_sensor(metrics.MESSAGE_PARSE, "Message Parse Time"),
+    _histogram_sensor(metrics.STATE_PARSE, "State Parse Time"),
+    _histogram_sensor(metrics.FANOUT, "Entity Update Time"),
 ]
 
 
@@ -112,8 +273,8 @@ class OfenInnovativSensor(OfenInnovativEntity, SensorEntity):
     @property
     def native_value(self) -> int | str | datetime | None:
         """Return the state."""
-        return self.entity_description.value_fn(self.coordinator.data)
+        return self._projected_value
 
     @property
     def icon(self) -> str:
-        return self.entity_description.dynamic_icon(self.coordinator.data)
+        return self._projected_icon
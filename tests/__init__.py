@@ -0,0 +1 @@
+"""Tests for the Ofen-Innovativ integration."""
@@ -0,0 +1,31 @@
+"""Tests for the model of the controller clock."""
+from datetime import datetime, timezone
+
+from custom_components.ofen_innovativ.api.clock import ClockModel
+from custom_components.ofen_innovativ.api.types import DateTimeInfo
+
+NOW = datetime(2024, 1, 15, 12, 0, 30, tzinfo=timezone.utc).timestamp()
+
+
+def _model(controller_time: datetime, source: int) -> ClockModel:
+    model = ClockModel(timezone.utc)
+    model.add_sample(NOW, DateTimeInfo(controller_time, source))
+    return model
+
+
+def test_no_sync_without_samples():
+    assert not ClockModel(timezone.utc).needs_sync(NOW, 120)
+
+
+def test_sync_when_off():
+    assert not _model(datetime(2024, 1, 15, 12, 0), 1).needs_sync(NOW, 120)
+    assert _model(datetime(2024, 1, 15, 12, 5), 1).needs_sync(NOW, 120)
+    assert _model(datetime(2024, 1, 15, 11, 55), 1).needs_sync(NOW, 120)
+
+
+def test_sync_when_unset():
+    model = _model(datetime(2024, 1, 15, 12, 0), 0)
+    assert model.needs_sync(NOW, 120)
+    # Once set, a clock still reported as unset is only set again when it is off
+    assert not model.needs_sync(NOW, 120, include_unset=False)
+    assert _model(datetime(2024, 1, 15, 12, 5), 0).needs_sync(NOW, 120, include_unset=False)
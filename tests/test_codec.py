@@ -0,0 +1,101 @@
+"""Tests for the framing of the messages exchanged with the controller."""
+import pytest
+
+from custom_components.ofen_innovativ.api import codec
+
+# A fireplace state: phase 2, 312 degrees, shutter at 40%, burning for 65 minutes
+FIREPLACE_STATE_MESSAGE = "aacc33550b00020138280105000000329b00"
+FIREPLACE_STATE_PAYLOAD = bytes.fromhex("0002013828010500000032")
+
+
+def test_parse_known_message():
+    assert codec.parse_message(FIREPLACE_STATE_MESSAGE) == FIREPLACE_STATE_PAYLOAD
+
+
+@pytest.mark.parametrize(
+    "data_type, message",
+    [(0x00, "aacc335501000000"), (0x22, "aacc335501222200"), (0xff, "aacc335501ffff00")],
+)
+def test_format_request(data_type: int, message: str):
+    assert codec.format_request(data_type) == message
+    assert codec.parse_message(message) == bytes((data_type,))
+
+
+def test_format_request_matches_format_message():
+    for data_type in range(0x100):
+        assert codec.format_request(data_type) == codec.format_message(bytes((data_type,)))
+
+
+@pytest.mark.parametrize("length", [0, 1, 0xfe, 0xff, 0x100, codec._MAX_PAYLOAD_LEN])
+def test_round_trip(length: int):
+    payload = bytes((i * 7) & 0xff for i in range(length))
+    message = codec.format_message(payload)
+    assert codec.parse_message(message) == payload
+    assert codec.parse_messages([message]) == [payload]
+
+
+@pytest.mark.parametrize("length", [0xff, 0x100, codec._MAX_PAYLOAD_LEN])
+def test_extended_length(length: int):
+    # Payloads of 255 bytes and more have a length byte of 0xff and a second length byte
+    frame = bytes.fromhex(codec.format_message(bytes(length)))
+    assert frame[codec._HEADER_LEN] == 0xff
+    assert frame[codec._HEADER_LEN + 1] == length - 0xff
+    assert len(frame) == codec._HEADER_LEN + 2 + length + codec._CHECKSUM.size
+
+
+def test_payload_too_big():
+    with pytest.raises(codec.PayloadTooBigError):
+        codec.format_message(bytes(codec._MAX_PAYLOAD_LEN + 1))
+
+
+def test_checksum_wraps_around():
+    payload = b"\xff" * 300
+    frame = bytes.fromhex(codec.format_message(payload))
+    assert int.from_bytes(frame[-2:], "little") == (0xff * 300) & 0xffff
+
+
+@pytest.mark.parametrize("position", [-1, -2, -3])
+def test_bad_checksum(position: int):
+    frame = bytearray.fromhex(FIREPLACE_STATE_MESSAGE)
+    frame[position] ^= 0x01
+    with pytest.raises(codec.ChecksumValidationError):
+        codec.parse_message(frame.hex())
+
+
+def test_missing_header():
+    with pytest.raises(codec.MissingHeaderError):
+        codec.parse_message("bbcc3355" + FIREPLACE_STATE_MESSAGE[8:])
+    with pytest.raises(codec.MissingHeaderError):
+        codec.parse_message("aacc33")
+
+
+@pytest.mark.parametrize("cut", [2, 4, 6, len(FIREPLACE_STATE_MESSAGE) - 8])
+def test_truncated(cut: int):
+    with pytest.raises(codec.PayloadLengthMismatchError):
+        codec.parse_message(FIREPLACE_STATE_MESSAGE[:-cut])
+
+
+def test_extended_length_truncated():
+    message = codec.format_message(bytes(0x100))
+    with pytest.raises(codec.PayloadLengthMismatchError):
+        codec.parse_message(message[:-4])
+
+
+def test_trailing_data():
+    with pytest.raises(codec.PayloadLengthMismatchError):
+        codec.parse_message(FIREPLACE_STATE_MESSAGE + "00")
+
+
+def test_parse_messages():
+    payloads = [b"", b"\x22\x17\x21\x0a\x0c\x1e", bytes(0x100), FIREPLACE_STATE_PAYLOAD]
+    messages = [codec.format_message(payload) for payload in payloads]
+    assert codec.parse_messages(messages) == payloads
+    assert codec.parse_messages(messages) == [codec.parse_message(message) for message in messages]
+
+
+def test_parse_messages_errors():
+    with pytest.raises(ValueError):
+        codec.parse_messages([FIREPLACE_STATE_MESSAGE, "aac"])
+    corrupt = FIREPLACE_STATE_MESSAGE[:-2] + "01"
+    with pytest.raises(codec.ChecksumValidationError):
+        codec.parse_messages([FIREPLACE_STATE_MESSAGE, corrupt])
@@ -0,0 +1,83 @@
+"""Tests for the queue serializing the commands sent on the controller's line."""
+import asyncio
+
+import pytest
+
+from custom_components.ofen_innovativ.api import metrics
+from custom_components.ofen_innovativ.api.command_queue import PRIORITY_POLL, PRIORITY_WRITE, CommandQueue
+
+
+def _command(sent: list, name: str):
+    async def send():
+        sent.append(name)
+        return name
+    return send
+
+
+def test_writes_before_polls():
+    async def run():
+        sent = []
+        queue = CommandQueue(metrics.ClientMetrics())
+        futures = [
+            queue.submit(_command(sent, "poll 1")),
+            queue.submit(_command(sent, "poll 2"), PRIORITY_POLL),
+            queue.submit(_command(sent, "write 1"), PRIORITY_WRITE),
+            queue.submit(_command(sent, "write 2"), PRIORITY_WRITE),
+        ]
+        assert len(queue) == 4
+        assert await asyncio.gather(*futures) == ["poll 1", "poll 2", "write 1", "write 2"]
+        return sent
+
+    assert asyncio.run(run()) == ["write 1", "write 2", "poll 1", "poll 2"]
+
+
+def test_pending_writes_are_merged():
+    async def run():
+        sent = []
+        client_metrics = metrics.ClientMetrics()
+        queue = CommandQueue(client_metrics)
+        first = queue.submit(_command(sent, "clock 1"), PRIORITY_WRITE, merge_key=0x23)
+        other = queue.submit(_command(sent, "other"), PRIORITY_WRITE, merge_key=0x24)
+        second = queue.submit(_command(sent, "clock 2"), PRIORITY_WRITE, merge_key=0x23)
+        assert second is first
+        assert len(queue) == 2
+        assert await asyncio.gather(first, other) == ["clock 2", "other"]
+        assert client_metrics.counters[metrics.MERGED_WRITES] == 1
+        # Once sent, a command no longer takes in later ones with the same key
+        third = queue.submit(_command(sent, "clock 3"), PRIORITY_WRITE, merge_key=0x23)
+        assert third is not first
+        assert await third == "clock 3"
+        return sent
+
+    assert asyncio.run(run()) == ["clock 2", "other", "clock 3"]
+
+
+def test_errors_and_cancelled_commands():
+    async def run():
+        sent = []
+
+        async def fail():
+            raise OSError("unreachable")
+
+        queue = CommandQueue(metrics.ClientMetrics())
+        failing = queue.submit(fail)
+        cancelled = queue.submit(_command(sent, "cancelled"))
+        cancelled.cancel()
+        last = queue.submit(_command(sent, "last"))
+        with pytest.raises(OSError):
+            await failing
+        assert await last == "last"
+        return sent
+
+    assert asyncio.run(run()) == ["last"]
+
+
+def test_close_cancels_pending_commands():
+    async def run():
+        queue = CommandQueue(metrics.ClientMetrics())
+        future = queue.submit(_command([], "poll"))
+        await queue.close()
+        assert future.cancelled()
+        assert len(queue) == 0
+
+    asyncio.run(run())
@@ -0,0 +1,49 @@
+"""Tests for the in-memory history of the fireplace state."""
+import pytest
+
+from custom_components.ofen_innovativ.api.types import FireplaceState
+from custom_components.ofen_innovativ.history import TIER_1MIN, TIER_RAW, FireplaceHistory
+
+
+def _state(temperature: int = 0, shutter: int = 0, burn_time_mins: int = 0, position: int = 0) -> FireplaceState:
+    return FireplaceState(
+        phase=15,
+        door=False,
+        temperature=temperature,
+        shutter=shutter,
+        movement=False,
+        burn_time_mins=burn_time_mins,
+        hood=0,
+        position=position,
+        alarm1=0,
+        alarm2=0,
+    )
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        # The temperature is an unsigned 16-bit value, e.g. 0xffff on a sensor fault
+        _state(temperature=0),
+        _state(temperature=32767),
+        _state(temperature=32768),
+        _state(temperature=65535),
+        # The shutter is offset by 150 above 100, ranging from -49 to 105
+        _state(shutter=-49),
+        _state(shutter=105),
+        # Burn time of 255 hours and 255 minutes, both bytes at their maximum
+        _state(burn_time_mins=255 * 60 + 255),
+        _state(position=255),
+    ],
+)
+def test_append_boundary_values(state: FireplaceState):
+    history = FireplaceHistory(raw_capacity=2)
+    history.append(0.0, state)
+    history.append(60.0, state)
+
+    for tier in (TIER_RAW, TIER_1MIN):
+        columns = history.as_dict(tier)
+        assert columns["temperature"][0] == state.temperature
+        assert columns["shutter"][0] == state.shutter
+        assert columns["burn_time_mins"][0] == state.burn_time_mins
+        assert columns["position"][0] == state.position
@@ -0,0 +1,127 @@
+"""Tests for the decoding of the message payloads."""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar
+
+import pytest
+
+from custom_components.ofen_innovativ.api.errors import UnexpectedResponseDataType
+from custom_components.ofen_innovativ.api.messages import REGISTRY, Compose, Field, MessageRegistry, compile_decoder
+from custom_components.ofen_innovativ.api.types import DateTimeInfo, FireplaceState
+
+# A fireplace state: phase 2, 312 degrees, shutter at 40%, burning for 65 minutes, at position 50
+FIREPLACE_STATE_PAYLOAD = bytes.fromhex("0002013828010500000032")
+FIREPLACE_STATE = FireplaceState(
+    phase=2, door=False, temperature=312, shutter=40, movement=False, burn_time_mins=65, hood=0, position=50,
+    alarm1=0, alarm2=0,
+)
+# 2023-01-10 12:30, set by the user (source 2)
+DATETIME_PAYLOAD = bytes.fromhex("2217210a0c1e")
+DATETIME_INFO = DateTimeInfo(datetime(2023, 1, 10, 12, 30), 2)
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [(FIREPLACE_STATE_PAYLOAD, FIREPLACE_STATE), (DATETIME_PAYLOAD, DATETIME_INFO)],
+)
+def test_decode_known_payload(payload: bytes, expected):
+    assert REGISTRY.decode(payload) == expected
+    assert type(expected).parse(payload, 1) == expected
+    assert type(expected).parse(payload[1:]) == expected
+    assert REGISTRY.types[payload[0]] is type(expected)
+
+
+def test_fireplace_state_flags():
+    # Door values 1 and 3 mean open; a shutter above 100 is moving and offset by 150
+    payload = bytearray(FIREPLACE_STATE_PAYLOAD)
+    payload[1] = 0x12
+    payload[4] = 150 + 40
+    state = FireplaceState.parse(bytes(payload), 1)
+    assert (state.phase, state.door, state.shutter, state.movement) == (2, True, 40, True)
+    payload[1] = 0x22
+    assert not FireplaceState.parse(bytes(payload), 1).door
+
+
+def test_fireplace_state_extra_bytes():
+    # The fireplace state may be followed by bytes the integration does not know
+    assert REGISTRY.decode(FIREPLACE_STATE_PAYLOAD + b"\x00\x00") == FIREPLACE_STATE
+
+
+def test_unknown_data_type():
+    with pytest.raises(UnexpectedResponseDataType):
+        REGISTRY.decode(b"\x0b\x00")
+
+
+def test_short_payload():
+    with pytest.raises(ValueError):
+        REGISTRY.decode(FIREPLACE_STATE_PAYLOAD[:-1])
+    with pytest.raises(ValueError):
+        REGISTRY.decode(DATETIME_PAYLOAD[:-1])
+
+
+def test_exact_size_mismatch():
+    with pytest.raises(ValueError):
+        REGISTRY.decode(DATETIME_PAYLOAD + b"\x00")
+
+
+@pytest.mark.parametrize("month_byte", [0x31, 0xf1])
+def test_invalid_datetime_source(month_byte: int):
+    payload = bytearray(DATETIME_PAYLOAD)
+    payload[2] = month_byte
+    with pytest.raises(ValueError):
+        REGISTRY.decode(bytes(payload))
+
+
+def test_invalid_datetime():
+    payload = bytearray(DATETIME_PAYLOAD)
+    payload[2] = 0x2d
+    with pytest.raises(ValueError):
+        REGISTRY.decode(bytes(payload))
+
+
+@dataclass(frozen=True)
+class _Pair:
+    __slots__ = ("first", "second")
+
+    first: int
+    second: int
+
+    DATA_TYPE: ClassVar[int] = 0x7f
+
+
+def test_compile_decoder():
+    decode = compile_decoder(_Pair, [
+        Field("first", 0, width=2, byteorder="little"),
+        Field("raw", 2, signed=True),
+        Compose("second", abs, ("raw",)),
+    ])
+    assert decode(b"\x01\x02\xfe") == _Pair(0x0201, 2)
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [
+        # Overlapping slots
+        [Field("first", 0, width=2), Field("second", 1)],
+        # Undeclared values
+        [Field("first", 0), Compose("second", abs, ("raw",))],
+        # Missing fields of the dataclass
+        [Field("first", 0)],
+        # Invalid names
+        [Field("first", 0), Field("second", 1), Field("payload", 2)],
+        [Field("first", 0), Field("second", 1), Field("_private", 2)],
+        # Unsupported widths
+        [Field("first", 0, width=3), Field("second", 3)],
+    ],
+)
+def test_compile_decoder_errors(layout):
+    with pytest.raises(ValueError):
+        compile_decoder(_Pair, layout)
+
+
+def test_duplicate_data_type():
+    registry = MessageRegistry()
+    layout = (Field("first", 0), Field("second", 1))
+    registry.message(*layout)(_Pair)
+    with pytest.raises(ValueError):
+        registry.message(*layout)(_Pair)
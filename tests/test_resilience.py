@@ -0,0 +1,88 @@
+"""Tests for the circuit breaker and the retry backoff."""
+import random
+
+import pytest
+
+from custom_components.ofen_innovativ.api.errors import CircuitOpenError
+from custom_components.ofen_innovativ.api.resilience import CircuitBreaker, backoff_delay
+
+
+def _open(breaker: CircuitBreaker, now: float = 0.0):
+    for _ in range(breaker.failure_threshold):
+        assert not breaker.acquire(now)
+        breaker.record_failure(now)
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10.0)
+    for _ in range(2):
+        assert not breaker.acquire(0.0)
+        breaker.record_failure(0.0)
+    assert breaker.is_closed
+    breaker.acquire(0.0)
+    breaker.record_failure(0.0)
+    assert not breaker.is_closed
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(9.9)
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=3)
+    for _ in range(2):
+        breaker.record_failure(0.0)
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure(0.0)
+    assert breaker.is_closed
+
+
+def test_probe_success_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0)
+    _open(breaker)
+    # Half-open: a single probe is admitted, and other requests are rejected meanwhile
+    assert breaker.acquire(10.0)
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(10.0)
+    breaker.record_success()
+    assert breaker.is_closed
+    assert not breaker.acquire(10.0)
+
+
+def test_probe_failure_doubles_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, max_reset_timeout=30.0)
+    _open(breaker)
+    assert breaker.acquire(10.0)
+    breaker.record_failure(10.0)
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(29.9)
+    assert breaker.acquire(30.0)
+    breaker.record_failure(30.0)
+    # Capped at max_reset_timeout
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire(59.9)
+    assert breaker.acquire(60.0)
+    breaker.record_success()
+    # The reset timeout starts over once the circuit has closed
+    _open(breaker, 100.0)
+    assert breaker.acquire(110.0)
+
+
+def test_released_probe_can_be_retried():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0)
+    _open(breaker)
+    assert breaker.acquire(10.0)
+    breaker.release()
+    assert breaker.acquire(10.0)
+    assert not breaker.is_closed
+
+
+@pytest.mark.parametrize("attempt", range(8))
+def test_backoff_delay_bounds(attempt: int):
+    rng_state = random.getstate()
+    try:
+        random.seed(attempt)
+        for _ in range(100):
+            delay = backoff_delay(attempt, 0.5, 10.0)
+            assert 0.0 <= delay <= min(10.0, 0.5 * 2 ** attempt)
+    finally:
+        random.setstate(rng_state)
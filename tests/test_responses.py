@@ -0,0 +1,120 @@
+"""Tests for the parsing of the controller's XML responses."""
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from custom_components.ofen_innovativ.api import responses
+from custom_components.ofen_innovativ.api.errors import ResponseParseError, ResponseValueError
+
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>'
+MAC_ADDRESS = "00:11:22:33:44:55"
+
+
+def _status(groups: bytes) -> bytes:
+    return XML_DECLARATION + b"<statusrecord>" + groups + b"</statusrecord>"
+
+
+WLAN0_GROUP = (
+    b'<statusgroup name="Interface" instance="wlan0">'
+    b'<statusitem name="IP Address"><value>192.168.1.50</value></statusitem>'
+    b'<statusitem name="MAC Address"><value>00:11:22:33:44:55</value></statusitem>'
+    b"</statusgroup>"
+)
+ETH0_GROUP = (
+    b'<statusgroup name="Interface" instance="eth0">'
+    b'<statusitem name="MAC Address"><value>66:77:88:99:aa:bb</value></statusitem>'
+    b"</statusgroup>"
+)
+
+
+def _action(body: bytes) -> bytes:
+    return XML_DECLARATION + b"<function>" + body + b"</function>"
+
+
+# Responses, and whether the scanner is expected to handle them without falling back
+STATUS_RESPONSES = [
+    (_status(WLAN0_GROUP), True),
+    (_status(ETH0_GROUP + WLAN0_GROUP), True),
+    (_status(WLAN0_GROUP).replace(b"><", b">\n  <"), True),
+    (_status(WLAN0_GROUP)[len(XML_DECLARATION):], True),
+    # Reordered attributes
+    (_status(WLAN0_GROUP.replace(b'name="Interface" instance="wlan0"', b'instance="wlan0" name="Interface"')), False),
+    (_status(WLAN0_GROUP.replace(b"<statusitem name=\"MAC", b"<statusitem  name=\"MAC")), False),
+    # Character references
+    (_status(WLAN0_GROUP.replace(b"00:11", b"00&#58;11")), False),
+    (_status(WLAN0_GROUP.replace(b"<value>00:11:22:33:44:55</value>",
+                                 b"<value><![CDATA[00:11:22:33:44:55]]></value>")), False),
+]
+
+ACTION_RESPONSES = [
+    (_action(b"<return><result>Succeeded</result><message>aacc33550b00</message></return>"), True),
+    (_action(b"\n <return>\n  <result>Succeeded</result>\n  <message>aacc</message>\n </return>\n"), True),
+    (_action(b"<return><result>Succeeded</result><message></message></return>"), True),
+    (_action(b"<return><result>Succeeded</result><message/></return>"), False),
+    (_action(b"<return><message>aacc</message><result>Succeeded</result></return>"), False),
+    (_action(b'<return><result>Succeeded</result><message lang="en">aacc</message></return>'), False),
+    (_action(b"<return><result>Succeeded</result><message>a&amp;c</message></return>"), False),
+    (_action(b"<return><result>Succeeded</result></return>"), False),
+]
+
+
+@pytest.mark.parametrize("response, scanned", STATUS_RESPONSES)
+def test_mac_address_scanner_agrees_with_parser(response: bytes, scanned: bool):
+    full = responses._parse_mac_address_full(response)
+    assert (responses._scan_mac_address(response) is not None) == scanned
+    if scanned:
+        assert responses._scan_mac_address(response) == full
+    assert responses.parse_mac_address(response) == full
+    assert full == MAC_ADDRESS
+
+
+@pytest.mark.parametrize("response, scanned", ACTION_RESPONSES)
+def test_action_message_scanner_agrees_with_parser(response: bytes, scanned: bool):
+    full = responses._parse_action_message_full(response)
+    assert (responses._scan_action_message(response) is not None) == scanned
+    if scanned:
+        assert responses._scan_action_message(response) == full
+    assert responses.parse_action_message(response) == full
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        _status(WLAN0_GROUP)[:-20],
+        _status(WLAN0_GROUP).replace(b"</statusitem>", b"</statusitm>", 2),
+        b"",
+    ],
+)
+def test_malformed_status(response: bytes):
+    assert responses._scan_mac_address(response) is None
+    with pytest.raises(ET.ParseError):
+        responses.parse_mac_address(response)
+
+
+def test_status_errors():
+    with pytest.raises(ResponseValueError):
+        responses.parse_mac_address(_status(ETH0_GROUP))
+    with pytest.raises(ResponseParseError):
+        responses.parse_mac_address(XML_DECLARATION + b"<function>" + WLAN0_GROUP + b"</function>")
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        _action(b"<return><result>Succeeded</result><message>aacc</message></return>")[:-15],
+        _action(b"<return><result>Succeeded</result><message>aacc</return>"),
+    ],
+)
+def test_malformed_action(response: bytes):
+    assert responses._scan_action_message(response) is None
+    with pytest.raises(ET.ParseError):
+        responses.parse_action_message(response)
+
+
+def test_action_errors():
+    with pytest.raises(ResponseValueError):
+        responses.parse_action_message(_action(b"<return><result>Failed</result><message>aacc</message></return>"))
+    with pytest.raises(ResponseParseError):
+        responses.parse_action_message(_action(b"<result>Succeeded</result>"))
+    with pytest.raises(ResponseParseError):
+        responses.parse_action_message(_status(WLAN0_GROUP))